@@ -0,0 +1 @@
+"""Performance benchmarks for budget_tracker. Run each one with `python -m benchmarks.<name>`."""
@@ -0,0 +1,66 @@
+"""Newest-cycle reads from SQL (cycle_totals) vs the in-memory ActiveCycle columns.
+
+    python -m benchmarks.bench_active_cycle --rows 100000
+
+Also reports the one-off load of the cycle and the refresh after another
+connection commits a row (PRAGMA data_version changes).
+"""
+import argparse
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+import timeit
+
+import budget_tracker as bt
+from benchmarks import datagen
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def per_call_us(fn, number):
+    fn()
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000, help="Transactions in the synthetic database")
+    parser.add_argument("--number", type=int, default=5000, help="Calls per timing")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # The refresh case writes, so work on a copy of the cached dataset.
+        bt.DB_NAME = shutil.copy(datagen.dataset(args.rows, os.path.join(ROOT, ".bench_data")), tmp)
+        bt.init_db()
+        cycle_id = bt.get_current_cycle()[0]
+        cases = [("calculate_burn_rate", lambda: bt.calculate_burn_rate(cycle_id)),
+                 ("get_category_totals", lambda: bt.get_category_totals(cycle_id)),
+                 ("chart_job", lambda: bt.chart_job(cycle_id))]
+        print(f"{'function':<24}{'SQL us':>10}{'memory us':>12}")
+        for name, fn in cases:
+            bt.ACTIVE_CYCLE_CACHE = False
+            sql = per_call_us(fn, args.number)
+            bt.ACTIVE_CYCLE_CACHE = True
+            memory = per_call_us(fn, args.number)
+            print(f"{name:<24}{sql:>10.2f}{memory:>12.2f}")
+
+        conn = bt.get_connection()
+        start = time.perf_counter()
+        cycle = bt.ActiveCycle.load(conn, cycle_id)
+        load_ms = (time.perf_counter() - start) * 1000
+        other = sqlite3.connect(bt.DB_NAME)
+        other.execute(bt.INSERT_TRANSACTION_SQL, (cycle_id, 'expense', "Dining", 450, "Bench", "2025-06-02T12:00:00",
+                                                  bt.to_epoch("2025-06-02T12:00:00")))
+        other.commit()
+        other.close()
+        start = time.perf_counter()
+        bt.calculate_burn_rate(cycle_id)
+        refresh_ms = (time.perf_counter() - start) * 1000
+        print(f"\nload cycle {cycle_id} ({len(cycle.amounts):,} rows): {load_ms:.1f} ms;"
+              f" burn rate after an external commit: {refresh_ms:.2f} ms")
+        bt.close_connections()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+"""Compares add_transaction throughput: per-call connections vs the ConnectionManager."""
+import argparse
+import contextlib
+import io
+import os
+import sqlite3
+import tempfile
+import time
+from datetime import datetime
+
+import budget_tracker as bt
+
+def legacy_add_transaction(cycle_id, t_type, amount, category, desc):
+    """The old implementation: open, insert, commit and close on every call."""
+    conn = sqlite3.connect(bt.DB_NAME)
+    cursor = conn.cursor()
+    cursor.execute("""
+        INSERT INTO transactions (cycle_id, type, category, amount, description, timestamp) 
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, (cycle_id, t_type, category, amount, desc, datetime.now().isoformat()))
+    conn.commit()
+    conn.close()
+    print(f"\n✅ Successfully added {category}: ${amount:,.2f}")
+
+def time_ops(func, cycle_id, n):
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        for i in range(n):
+            func(cycle_id, 'expense', 1.25 + i % 50, "Food", "Bench Entry")
+        elapsed = time.perf_counter() - start
+    return n / elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--ops", type=int, default=2000, help="Transactions per run")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bt.DB_NAME = os.path.join(tmp, "bench.db")
+        bt.init_db()
+        cycle_id = bt.start_new_cycle(5000.0)
+
+        before = time_ops(legacy_add_transaction, cycle_id, args.ops)
+        after = time_ops(bt.add_transaction, cycle_id, args.ops)
+        bt.close_connections()
+
+    print(f"{'variant':<22}{'ops/sec':>12}")
+    print(f"{'per-call connect':<22}{before:>12,.0f}")
+    print(f"{'ConnectionManager':<22}{after:>12,.0f}")
+    print(f"speedup: {after / before:.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Load test for the HTTP API: requests/s and tail latency under a read/write mix.
+
+    python -m benchmarks.bench_api_load --clients 16 --duration 10 --write-ratio 0.2
+
+Starts `budget_tracker.py api` on a copy of a seeded dataset and drives it with
+keep-alive clients, each picking a request from the mix below per iteration.
+The clients share this one process, so at high --clients it measures the
+client as much as the server; run several copies with --port to push harder.
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import timedelta
+
+from benchmarks import datagen
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# (name, path, weight); every write changes the current chart, so most charts are re-renders.
+READS = (
+    ("GET /cycles/current/burn-rate", "/cycles/current/burn-rate", 8),
+    ("GET /cycles/current", "/cycles/current", 4),
+    ("GET /transactions", "/transactions?start={week_start}&end={week_end}&limit=50", 4),
+    ("GET /cycles", "/cycles", 2),
+    ("GET /cycles/current/chart", "/cycles/current/chart", 1),
+)
+CATEGORIES = ("Groceries", "Dining", "Transport", "Fun")
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def wait_for(port, server, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline and server.poll() is None:
+        try:
+            socket.create_connection(("127.0.0.1", port), 0.2).close()
+            return
+        except OSError:
+            time.sleep(0.05)
+    sys.exit("❌ API server did not start")
+
+def client(port, args, stop, results, seed):
+    rng = random.Random(seed)
+    weights = [weight for *_, weight in READS]
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    # A week inside the newest generated cycle.
+    week = {"week_start": datagen.LAST_CYCLE_START + timedelta(days=7),
+            "week_end": datagen.LAST_CYCLE_START + timedelta(days=13)}
+    while not stop.is_set():
+        if rng.random() < args.write_ratio:
+            name, method, path = "POST /transactions", "POST", "/transactions"
+            body = json.dumps({"amount": round(rng.uniform(1, 80), 2), "category": rng.choice(CATEGORIES),
+                               "description": "load test"})
+        else:
+            name, path, _ = rng.choices(READS, weights)[0]
+            method, body, path = "GET", None, path.format(**week)
+        start = time.perf_counter()
+        conn.request(method, path, body, {"Content-Type": "application/json"} if body else {})
+        response = conn.getresponse()
+        response.read()
+        elapsed = time.perf_counter() - start
+        results.setdefault(name, []).append(elapsed)
+        if response.status >= 400:
+            results.setdefault("errors", []).append(response.status)
+    conn.close()
+
+def percentile(ordered, q):
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)] * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000, help="Transactions in the synthetic database")
+    parser.add_argument("--clients", type=int, default=16, help="Concurrent keep-alive connections")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds of load")
+    parser.add_argument("--write-ratio", type=float, default=0.2, help="Share of requests that are POSTs")
+    parser.add_argument("--port", type=int, help="Load an already running server instead of starting one")
+    parser.add_argument("--profile", choices=("durable", "fast"), default="fast", help="Pragma profile of the server")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        server = None
+        port = args.port
+        if port is None:
+            # The load writes, so serve a copy of the cached dataset.
+            db = shutil.copy(datagen.dataset(args.rows, os.path.join(ROOT, ".bench_data")), tmp)
+            port = free_port()
+            server = subprocess.Popen([sys.executable, os.path.join(ROOT, "budget_tracker.py"), "--db", db,
+                                       "--profile", args.profile, "api", "--port", str(port)],
+                                      cwd=tmp, stderr=subprocess.DEVNULL)
+            wait_for(port, server)
+        try:
+            stop = threading.Event()
+            per_client = [{} for _ in range(args.clients)]
+            threads = [threading.Thread(target=client, args=(port, args, stop, results, seed), daemon=True)
+                       for seed, results in enumerate(per_client)]
+            start = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            time.sleep(args.duration)
+            stop.set()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - start
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait(10)
+
+    merged = {}
+    for results in per_client:
+        for name, samples in results.items():
+            merged.setdefault(name, []).extend(samples)
+    errors = merged.pop("errors", [])
+    total = sum(len(samples) for samples in merged.values())
+    print(f"{args.clients} clients, {elapsed:.1f}s, write ratio {args.write_ratio:.0%}: "
+          f"{total:,} requests, {total / elapsed:,.0f} req/s, {len(errors)} errors")
+    print(f"{'endpoint':<32}{'count':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for name, samples in sorted(merged.items()) + [("all", [s for v in merged.values() for s in v])]:
+        ordered = sorted(samples)
+        print(f"{name:<32}{len(ordered):>9,}{statistics.median(ordered) * 1000:>10.2f}"
+              f"{percentile(ordered, 0.95):>10.2f}{percentile(ordered, 0.99):>10.2f}{ordered[-1] * 1000:>10.2f}")
+    return 1 if errors else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+"""Event-loop lag while 1,000 coroutines use the tracker, via AsyncTracker vs direct blocking calls.
+
+    python -m benchmarks.bench_async_loop --coroutines 1000
+
+A ticker coroutine asks to wake every --tick-ms and records how late it
+actually runs. Each worker coroutine reads the current cycle, adds a
+transaction and computes the burn rate; every --chart-every'th also renders
+the chart, with the chart cache emptied first so those are real renders.
+The "floor" row makes the same calls as no-ops on an executor thread: the
+lag of scheduling 1,000 coroutines at once, which no facade can avoid.
+Exits 1 if the AsyncTracker run's worst lag exceeds --max-lag-ms.
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import budget_tracker as bt
+from budget_async import AsyncTracker
+from benchmarks import datagen
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class BlockingTracker:
+    """The same calls made straight from the coroutines, as code without the facade would."""
+
+    async def get_current_cycle(self):
+        return bt.get_current_cycle()
+
+    async def add_transaction(self, *args):
+        return bt.add_transaction(*args, quiet=True)
+
+    async def calculate_burn_rate(self, cycle_id):
+        return bt.calculate_burn_rate(cycle_id)
+
+    async def generate_visual_report(self, cycle_id):
+        return bt.generate_visual_report(cycle_id, quiet=True)
+
+class FloorTracker(AsyncTracker):
+    """AsyncTracker's thread hop with no database work behind it."""
+
+    async def get_current_cycle(self):
+        return await self.run(lambda: (1,))
+
+    async def add_transaction(self, *args):
+        return await self.run(lambda: None)
+
+    async def calculate_burn_rate(self, cycle_id):
+        return await self.run(lambda: None)
+
+    async def generate_visual_report(self, cycle_id):
+        return await self.run(lambda: None)
+
+async def ticker(interval, lags, stop):
+    while not stop.is_set():
+        expected = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        lags.append(max(time.perf_counter() - expected, 0.0))
+
+async def worker(tracker, number, chart_every):
+    cycle = await tracker.get_current_cycle()
+    await tracker.add_transaction(cycle[0], 'expense', 1 + number % 50, "Dining", "Loop bench")
+    await tracker.calculate_burn_rate(cycle[0])
+    if chart_every and number % chart_every == 0:
+        await tracker.generate_visual_report(cycle[0])
+
+async def run(tracker, args):
+    lags, stop = [], asyncio.Event()
+    tick = asyncio.create_task(ticker(args.tick_ms / 1000, lags, stop))
+    await asyncio.sleep(args.tick_ms / 1000 * 3)  # Let the ticker settle
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(tracker, n, args.chart_every) for n in range(args.coroutines)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await tick
+    return elapsed, sorted(lags)
+
+def report(label, elapsed, lags, coroutines):
+    pick = lambda q: lags[min(int(q * len(lags)), len(lags) - 1)] * 1000
+    print(f"{label:<14}{elapsed:>9.2f}s{coroutines / elapsed:>10,.0f}/s{pick(0.5):>10.2f}{pick(0.99):>10.2f}"
+          f"{lags[-1] * 1000:>10.2f}{len(lags):>8,}")
+    return lags[-1] * 1000
+
+async def main_async(args):
+    print(f"{'mode':<14}{'elapsed':>10}{'coros':>11}{'lag p50':>10}{'lag p99':>10}{'lag max':>10}{'ticks':>8}")
+    floor = FloorTracker()
+    elapsed, lags = await run(floor, args)
+    report("floor", elapsed, lags, args.coroutines)
+    floor._db.shutdown()
+
+    # AsyncTracker before blocking: the blocking run imports matplotlib here, which makes every later full GC slower.
+    bt.get_chart_cache().clear()
+    async with AsyncTracker(chart_workers=args.chart_workers) as tracker:
+        await tracker.generate_visual_report(1)  # Start the chart worker and import matplotlib there
+        elapsed, lags = await run(tracker, args)
+    worst = report("AsyncTracker", elapsed, lags, args.coroutines)
+
+    bt.get_chart_cache().clear()
+    elapsed, lags = await run(BlockingTracker(), args)
+    report("blocking", elapsed, lags, args.coroutines)
+    return worst
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000, help="Transactions in the synthetic database")
+    parser.add_argument("--coroutines", type=int, default=1000)
+    parser.add_argument("--chart-every", type=int, default=100, help="Every Nth coroutine renders the chart (0: none)")
+    parser.add_argument("--chart-workers", type=int, default=1)
+    parser.add_argument("--tick-ms", type=float, default=5.0)
+    parser.add_argument("--max-lag-ms", type=float, default=100.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Workers write, so run on a copy of the cached dataset.
+        bt.DB_NAME = shutil.copy(datagen.dataset(args.rows, os.path.join(ROOT, ".bench_data")), tmp)
+        bt.CHART_CACHE_DIR = os.path.join(tmp, "charts")
+        bt.REPORT_PATH = os.path.join(tmp, "report_{cycle_id}.png")
+        try:
+            worst = asyncio.run(main_async(args))
+        finally:
+            bt.close_connections()
+            bt.close_renderer()
+    if worst > args.max_lag_ms:
+        print(f"❌ AsyncTracker stalled the loop for {worst:.1f} ms (limit {args.max_lag_ms:.0f} ms)")
+        return 1
+    print(f"✅ Worst loop lag {worst:.1f} ms with AsyncTracker (limit {args.max_lag_ms:.0f} ms)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,39 @@
+"""Measures add_transactions bulk-ingestion throughput in rows/sec."""
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import budget_tracker as bt
+
+CATEGORIES = ("Food", "Rent", "Transport", "Entertainment", "Shopping", "Health")
+
+def generate_rows(n):
+    """Yields a year of synthetic bank history, cycling through precomputed timestamps."""
+    base = datetime(2024, 1, 1)
+    stamps = [(base + timedelta(minutes=37 * i)).isoformat() for i in range(14_000)]
+    for i in range(n):
+        yield ('expense', 1.0 + (i * 7919) % 20000 / 100, CATEGORIES[i % len(CATEGORIES)],
+               "Bank Import", stamps[i % len(stamps)])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--rows", type=int, default=500_000)
+    parser.add_argument("--batch-size", type=int, default=bt.BULK_BATCH_SIZE)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bt.DB_NAME = os.path.join(tmp, "bench.db")
+        bt.init_db()
+        cycle_id = bt.start_new_cycle(5000.0)
+
+        start = time.perf_counter()
+        inserted = bt.add_transactions(cycle_id, generate_rows(args.rows), batch_size=args.batch_size)
+        elapsed = time.perf_counter() - start
+        bt.close_connections()
+
+    print(f"inserted {inserted:,} rows in {elapsed:.2f}s -> {inserted / elapsed:,.0f} rows/sec")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Per-command latency: cold CLI process vs thin client vs raw socket round trip to the daemon."""
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import budget_client
+from benchmarks import datagen
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+COMMANDS = (["burn-rate"], ["report"], ["chart"], ["add", "4.50", "Dining"])
+
+def median_ms(fn, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+def run(cmd, cwd, env=None):
+    subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, cwd=cwd, env=env)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000, help="Transactions in the synthetic database")
+    parser.add_argument("--runs", type=int, default=10, help="Process launches per command")
+    parser.add_argument("--round-trips", type=int, default=500, help="Socket requests per command")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Commands write, so work on a copy of the cached dataset.
+        db = shutil.copy(datagen.dataset(args.rows, os.path.join(ROOT, ".bench_data")), tmp)
+        sock = os.path.join(tmp, "bench.sock")
+        env = dict(os.environ, BUDGET_SOCKET=sock)
+        tracker = [sys.executable, os.path.join(ROOT, "budget_tracker.py"), "--db", db]
+        daemon = subprocess.Popen(tracker + ["daemon", "--socket", sock], cwd=tmp, stderr=subprocess.DEVNULL)
+        try:
+            deadline = time.time() + 30
+            while not os.path.exists(sock):
+                if time.time() > deadline or daemon.poll() is not None:
+                    sys.exit("❌ daemon did not start")
+                time.sleep(0.05)
+
+            print(f"{'command':<20}{'cold CLI ms':>14}{'client ms':>12}{'socket ms':>12}")
+            for argv in COMMANDS:
+                cold = median_ms(lambda: run(tracker + argv, tmp), args.runs)
+                client = median_ms(lambda: run([sys.executable, os.path.join(ROOT, "budget_client.py")] + argv, tmp, env),
+                                   args.runs)
+                socket_ms = median_ms(lambda: budget_client.request({"argv": argv}, sock), args.round_trips)
+                print(f"{' '.join(argv):<20}{cold:>14.1f}{client:>12.1f}{socket_ms:>12.3f}")
+        finally:
+            daemon.terminate()
+            daemon.wait(10)
+
+if __name__ == "__main__":
+    main()
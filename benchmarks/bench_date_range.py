@@ -0,0 +1,61 @@
+"""Spend-between-two-dates latency: ISO text timestamps vs the indexed ts_epoch column."""
+import argparse
+import os
+import tempfile
+import time
+from datetime import date
+
+import budget_tracker as bt
+
+BASE_EPOCH = bt.to_epoch(date(2020, 1, 1))
+
+def populate(rows, spacing):
+    """Inserts rows spread `spacing` seconds apart, generated inside SQLite for speed."""
+    with bt.transaction() as conn:
+        conn.execute(f"""
+            WITH RECURSIVE seq(i) AS (SELECT 0 UNION ALL SELECT i + 1 FROM seq WHERE i < ? - 1)
+            INSERT INTO transactions (cycle_id, type, category, amount, description, timestamp, ts_epoch)
+            SELECT 1, CASE WHEN i % 20 = 0 THEN 'income' ELSE 'expense' END,
+                   'Cat' || (i % 12), ((i * 7919) % 99991) + 1, 'Bench',
+                   strftime('%Y-%m-%dT%H:%M:%S', {BASE_EPOCH} + i * ?, 'unixepoch'), {BASE_EPOCH} + i * ?
+            FROM seq""", (rows, spacing, spacing))
+
+def best_of(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--rows", type=int, default=3_000_000)
+    parser.add_argument("--spacing", type=int, default=60, help="Seconds between generated transactions")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bt.DB_NAME = os.path.join(tmp, "bench.db")
+        bt.init_db()
+        bt.start_new_cycle(5000.0)
+        start = time.perf_counter()
+        populate(args.rows, args.spacing)
+        print(f"populated {args.rows:,} rows in {time.perf_counter() - start:.1f}s")
+
+        conn = bt.get_connection()
+        print(f"{'window':<12}{'text (ms)':>12}{'epoch (ms)':>12}{'speedup':>10}")
+        for days in (1, 7, 30, 365):
+            lo, hi = date(2021, 1, 1), date.fromordinal(date(2021, 1, 1).toordinal() + days - 1)
+            text_lo, text_hi = lo.isoformat(), date.fromordinal(hi.toordinal() + 1).isoformat()
+            text_time, text_total = best_of(lambda: conn.execute(
+                "SELECT SUM(amount) FROM transactions WHERE type = 'expense' AND timestamp >= ? AND timestamp < ?",
+                (text_lo, text_hi)).fetchone()[0] or 0, args.repeat)
+            epoch_time, epoch_total = best_of(lambda: bt.spend_between(lo, hi), args.repeat)
+            assert bt.from_cents(text_total) == epoch_total, (text_total, epoch_total)
+            print(f"{f'{days} day(s)':<12}{text_time * 1000:>12.2f}{epoch_time * 1000:>12.3f}"
+                  f"{text_time / epoch_time:>9.0f}x")
+        bt.close_connections()
+
+if __name__ == "__main__":
+    main()
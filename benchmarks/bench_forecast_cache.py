@@ -0,0 +1,82 @@
+"""Dashboard polling of calculate_burn_rate with and without the forecast memo.
+
+    python -m benchmarks.bench_forecast_cache --duration 3 --write-ms 50
+
+The main thread polls the newest cycle's forecast in a tight loop while a
+writer thread adds a transaction to it every --write-ms milliseconds. Runs
+with the cached SQL query, the in-memory active cycle, and the Forecaster on
+top of it, and prints polls/s, per-poll latency and how many polls the memo served.
+"""
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+import budget_tracker as bt
+from benchmarks import datagen
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODES = (
+    ("query cache", False, False),
+    ("active cycle", True, False),
+    ("forecast memo", True, True),
+)
+
+def writer(cycle_id, interval, stop):
+    while not stop.wait(interval):
+        bt.add_transaction(cycle_id, 'expense', 4.5, "Dining", "Forecast bench", quiet=True)
+    bt.get_manager().release()
+
+def polls(cycle_id, duration, write_ms):
+    stop = threading.Event()
+    thread = threading.Thread(target=writer, args=(cycle_id, write_ms / 1000, stop)) if write_ms else None
+    if thread is not None:
+        thread.start()
+    samples = []
+    deadline = time.perf_counter() + duration
+    while True:
+        start = time.perf_counter()
+        if start >= deadline:
+            break
+        bt.calculate_burn_rate(cycle_id)
+        samples.append(time.perf_counter() - start)
+    stop.set()
+    if thread is not None:
+        thread.join()
+    return samples
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000, help="Transactions in the synthetic database")
+    parser.add_argument("--duration", type=float, default=3.0, help="Seconds of polling per mode")
+    parser.add_argument("--write-ms", type=float, default=50, help="Milliseconds between writes (0: never write)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # The writer adds rows, so work on a copy of the cached dataset.
+        bt.DB_NAME = shutil.copy(datagen.dataset(args.rows, os.path.join(ROOT, ".bench_data")), tmp)
+        bt.init_db()
+        cycle_id = bt.get_current_cycle()[0]
+        results = []
+        for name, active, memo in MODES:
+            bt.ACTIVE_CYCLE_CACHE, bt.FORECAST_CACHE = active, memo
+            bt.calculate_burn_rate(cycle_id)  # Warm up
+            results.append((name, sorted(polls(cycle_id, args.duration, args.write_ms))))
+        stats = bt.get_forecaster().stats()
+        bt.close_connections()
+
+    print(f"{args.duration:g}s of polling per mode, a write every {f'{args.write_ms:g} ms' if args.write_ms else 'never'}")
+    print(f"{'mode':<16}{'polls/s':>14}{'p50 us':>10}{'p99 us':>10}{'max us':>10}")
+    for name, samples in results:
+        print(f"{name:<16}{len(samples) / args.duration:>14,.0f}{statistics.median(samples) * 1e6:>10.1f}"
+              f"{samples[int(0.99 * len(samples))] * 1e6:>10.1f}{samples[-1] * 1e6:>10.1f}")
+    print(f"memo: {stats['hit_rate']:.3%} of polls served without SQL, {stats['misses']:,} computed inline,"
+          f" {stats['refreshes']:,} background refreshes")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
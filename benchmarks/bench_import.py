@@ -0,0 +1,77 @@
+"""Rows/sec and peak RSS of budget_importer.import_csv on a generated bank statement.
+
+The statement is then re-imported with 90% of its lines unchanged, which should
+run close to the speed of a parse-only scan and insert only the new 10%.
+"""
+import argparse
+import csv
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+
+import budget_tracker as bt
+import budget_importer
+from benchmarks.bench_bulk_insert import CATEGORIES
+
+def write_statement(path, n, seed=42, fresh_every=0):
+    """Same seed, same lines; with fresh_every=k every k-th line gets a new description."""
+    rng = random.Random(seed)
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Date", "Description", "Amount", "Category"])
+        for i in range(n):
+            amount = rng.randint(1, 50_000) / 100
+            desc = f"New merchant {i}" if fresh_every and i % fresh_every == 0 else f"Merchant {i % 500}"
+            writer.writerow([f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}", desc,
+                             f"{-amount if rng.random() < 0.9 else amount:.2f}", rng.choice(CATEGORIES)])
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+
+def scan(path, workers, chunk_size):
+    """Parse-only pass over the file: the floor for any import."""
+    with open(path, newline="") as f:
+        reader = csv.reader(f)
+        columns = budget_importer._resolve_columns({**budget_importer.DEFAULT_MAPPING, "category": "Category"},
+                                                   next(reader))
+        options = {"date_format": None, "expense_sign": "negative", "default_category": "Misc"}
+        workers = budget_importer.default_workers() if workers is None else workers
+        start = time.perf_counter()
+        for _ in budget_importer._parsed_chunks(reader, chunk_size or budget_importer.CHUNK_SIZE, workers,
+                                                (1, columns, options)):
+            pass
+        return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--rows", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, help="Parser processes (default: importer default)")
+    parser.add_argument("--chunk-size", type=int)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "statement.csv")
+        write_statement(path, args.rows)
+        bt.DB_NAME = os.path.join(tmp, "bench.db")
+        bt.init_db()
+        cycle_id = bt.start_new_cycle(5000.0)
+        options = {"workers": args.workers, "chunk_size": args.chunk_size}
+        first = budget_importer.import_csv(path, cycle_id, {"category": "Category"}, **options)
+
+        write_statement(path, args.rows, fresh_every=10)
+        scan_seconds = scan(path, args.workers, args.chunk_size)
+        second = budget_importer.import_csv(path, cycle_id, {"category": "Category"}, **options)
+        bt.close_connections()
+
+    print(f"First import : {first['inserted']:>10,} rows in {first['seconds']:6.2f}s  {first['rows_per_sec']:>10,.0f} rows/s")
+    print(f"Parse only   : {args.rows:>10,} rows in {scan_seconds:6.2f}s  {args.rows / scan_seconds:>10,.0f} rows/s")
+    print(f"Re-import    : {second['inserted']:>10,} new, {second['duplicates']:,} duplicates in "
+          f"{second['seconds']:.2f}s  {second['rows_per_sec']:,.0f} rows/s")
+    print(f"Peak RSS (main process): {peak_rss_mb():.1f} MiB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Aggregation throughput and exactness: INTEGER cents vs the old REAL amount schema."""
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+
+# Deterministic cents per row; both schemas receive the same values.
+CENTS_EXPR = "((i * 7919) % 99991) + 1"
+
+def build(path, column_type, rows, cycles):
+    value = CENTS_EXPR if column_type == "INTEGER" else f"({CENTS_EXPR}) / 100.0"
+    conn = sqlite3.connect(path)
+    conn.execute(f"CREATE TABLE transactions (cycle_id INTEGER, type TEXT, amount {column_type})")
+    conn.execute(f"""
+        WITH RECURSIVE seq(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM seq WHERE i < ?)
+        INSERT INTO transactions (cycle_id, type, amount)
+        SELECT i % ?, 'expense', {value} FROM seq""", (rows, cycles))
+    conn.commit()
+    return conn
+
+def timed(conn, sql, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = conn.execute(sql).fetchall()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--rows", type=int, default=10_000_000)
+    parser.add_argument("--cycles", type=int, default=120)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    expected_total = sum(((i * 7919) % 99991) + 1 for i in range(1, args.rows + 1))
+    print(f"{'schema':<10}{'SUM rows/s':>16}{'GROUP BY rows/s':>18}{'SUM (cents)':>20}{'error (cents)':>16}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for column_type in ("REAL", "INTEGER"):
+            conn = build(os.path.join(tmp, f"{column_type}.db"), column_type, args.rows, args.cycles)
+            sum_time, [(total,)] = timed(conn, "SELECT SUM(amount) FROM transactions", args.repeat)
+            group_time, _ = timed(conn, "SELECT cycle_id, SUM(amount) FROM transactions GROUP BY cycle_id", args.repeat)
+            conn.close()
+            total_cents = total if column_type == "INTEGER" else total * 100
+            error = total_cents - expected_total
+            print(f"{column_type:<10}{args.rows / sum_time:>16,.0f}{args.rows / group_time:>18,.0f}"
+                  f"{total_cents:>20,.2f}{error:>16.6f}")
+    print(f"expected total: {expected_total:,} cents")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Inserts/sec and read latency (with a concurrent writer) under each pragma profile."""
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+import budget_tracker as bt
+from benchmarks.bench_bulk_insert import generate_rows
+
+def read_latencies(cycle_id, reads, stop_writer):
+    """Times calculate_burn_rate on this thread while another thread keeps committing."""
+    def writer():
+        with contextlib.redirect_stdout(io.StringIO()):
+            while not stop_writer.is_set():
+                bt.add_transaction(cycle_id, 'expense', 1.0, "Food", "Writer")
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    samples = []
+    try:
+        for _ in range(reads):
+            start = time.perf_counter()
+            bt.calculate_burn_rate(cycle_id)
+            samples.append(time.perf_counter() - start)
+    finally:
+        stop_writer.set()
+        thread.join()
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.99) - 1]
+
+def run_profile(profile, tmp, args):
+    bt.DB_NAME = os.path.join(tmp, f"{profile}.db")
+    bt.init_db(profile)
+    cycle_id = bt.start_new_cycle(5000.0)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        for i in range(args.single):
+            bt.add_transaction(cycle_id, 'expense', 1.0 + i % 50, "Food", "Bench")
+        single = args.single / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    bt.add_transactions(cycle_id, generate_rows(args.bulk))
+    bulk = args.bulk / (time.perf_counter() - start)
+
+    p50, p99 = read_latencies(cycle_id, args.reads, threading.Event())
+    bt.close_connections()
+    return single, bulk, p50, p99
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--single", type=int, default=2000, help="add_transaction calls (one commit each)")
+    parser.add_argument("--bulk", type=int, default=200_000, help="Rows for add_transactions")
+    parser.add_argument("--reads", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'profile':<12}{'commits/s':>12}{'bulk rows/s':>14}{'read p50 (us)':>16}{'read p99 (us)':>16}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for profile in bt.PRAGMA_PROFILES:
+            single, bulk, p50, p99 = run_profile(profile, tmp, args)
+            print(f"{profile:<12}{single:>12,.0f}{bulk:>14,.0f}{p50 * 1e6:>16.1f}{p99 * 1e6:>16.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Read-heavy session with and without the query result cache.
+
+    python -m benchmarks.bench_query_cache --reads 20000 --write-every 50
+
+Loops over the report reads (burn rate, all forecasts, category totals,
+30-day spend and category spend) and adds a transaction every --write-every
+reads, which invalidates the cache. Prints reads/s for both runs and the
+cache's hit rate and size.
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import timedelta
+
+import budget_tracker as bt
+from benchmarks import datagen
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def session(reads, write_every):
+    cycle_id = bt.get_current_cycle()[0]
+    month = (datagen.LAST_CYCLE_START, datagen.LAST_CYCLE_START + timedelta(days=29))
+    calls = [lambda: bt.calculate_burn_rate(cycle_id), bt.calculate_burn_rates,
+             lambda: bt.get_category_totals(cycle_id), lambda: bt.spend_between(*month),
+             lambda: bt.category_spend_between(*month)]
+    start = time.perf_counter()
+    for i in range(reads):
+        calls[i % len(calls)]()
+        if write_every and i % write_every == write_every - 1:
+            bt.add_transaction(cycle_id, 'expense', 4.5, "Dining", "Cache bench", quiet=True)
+    return reads / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000, help="Transactions in the synthetic database")
+    parser.add_argument("--reads", type=int, default=20_000)
+    parser.add_argument("--write-every", type=int, default=50, help="Reads between writes (0: never write)")
+    parser.add_argument("--budget-kib", type=int, default=bt.QUERY_CACHE_BYTES // 2**10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # The session writes, so work on a copy of the cached dataset.
+        bt.DB_NAME = shutil.copy(datagen.dataset(args.rows, os.path.join(ROOT, ".bench_data")), tmp)
+        bt.init_db()
+        bt.QUERY_CACHE_BYTES = 0
+        off = session(args.reads, args.write_every)
+        bt.QUERY_CACHE_BYTES = args.budget_kib * 2**10
+        on = session(args.reads, args.write_every)
+        stats = bt.query_cache_stats()
+        bt.close_connections()
+    print(f"{args.reads:,} reads, a write every {args.write_every or 'never'}")
+    print(f"  cache off: {off:>12,.0f} reads/s")
+    print(f"  cache on : {on:>12,.0f} reads/s  ({on / off:.1f}x)")
+    print(f"  hit rate {stats['hit_rate']:.1%}, {stats['stale']:,} stale, {stats['evictions']:,} evicted,"
+          f" {stats['entries']} entries, {stats['bytes'] / 2**10:,.1f} of {stats['max_bytes'] / 2**10:,.0f} KiB")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
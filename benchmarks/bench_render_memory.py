@@ -0,0 +1,63 @@
+"""Renders many reports through the shared ChartRenderer and checks that RSS stays flat.
+
+The chart cache is bypassed so every iteration really redraws the figure.
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+import budget_tracker as bt
+
+def rss_mb():
+    """Current resident set size in MiB (Linux /proc, falling back to peak RSS)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--reports", type=int, default=1000)
+    parser.add_argument("--warmup", type=int, default=25)
+    parser.add_argument("--max-growth-mb", type=float, default=8.0)
+    args = parser.parse_args()
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        bt.DB_NAME = os.path.join(tmp, "bench.db")
+        bt.init_db()
+        cycle_id = bt.start_new_cycle(5000.0)
+        bt.add_transactions(cycle_id, [('expense', 10.0 + i, cat, "Bench", None)
+                                       for i, cat in enumerate(("Food", "Rent", "Transport", "Health"))])
+        labels, values = zip(*bt.get_connection().execute(bt.HOT_QUERIES["category_breakdown"][0], (cycle_id,)))
+        renderer = bt.get_renderer()
+
+        def render():
+            renderer.render_pie(labels, values, f"Spending Distribution (Cycle {cycle_id})", "report.png")
+
+        for _ in range(args.warmup):
+            render()
+        baseline = rss_mb()
+        for i in range(args.reports):
+            render()
+            if i % 100 == 99:
+                sys.stderr.write(f"  {i + 1:>5} reports  rss {rss_mb():.1f} MiB\n")
+        final = rss_mb()
+        bt.close_renderer()
+        bt.close_connections()
+        os.chdir(cwd)
+
+    growth = final - baseline
+    print(f"rss after warmup {baseline:.1f} MiB, after {args.reports} reports {final:.1f} MiB (+{growth:.1f} MiB)")
+    if growth > args.max_growth_mb:
+        print(f"❌ RSS grew more than {args.max_growth_mb} MiB")
+        sys.exit(1)
+    print("✅ RSS stayed flat")
+
+if __name__ == "__main__":
+    main()
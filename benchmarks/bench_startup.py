@@ -0,0 +1,65 @@
+"""Guards CLI cold-start time: import cost via `python -X importtime` and time to the first menu prompt.
+
+Exits non-zero if matplotlib is imported at startup or if the median time to
+reach the menu exceeds --budget-ms.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT = os.path.join(ROOT, "budget_tracker.py")
+
+def import_profile():
+    """Returns ({module: cumulative_us}, total_us) for `import budget_tracker`."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", "import budget_tracker"],
+                          cwd=ROOT, capture_output=True, text=True, check=True)
+    modules = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        modules[name.strip()] = int(cumulative)
+    return modules, modules.get("budget_tracker", 0)
+
+def time_to_menu(workdir):
+    """Launches the menu, answers 'Exit' and returns the wall-clock seconds."""
+    start = time.perf_counter()
+    subprocess.run([sys.executable, SCRIPT], cwd=workdir, input="4\n",
+                   capture_output=True, text=True, check=True)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--budget-ms", type=float, default=150.0, help="Max median time to the first prompt")
+    args = parser.parse_args()
+
+    modules, total_us = import_profile()
+    heavy = sorted(name for name in modules if name.split(".")[0] == "matplotlib")
+    print(f"import budget_tracker: {total_us / 1000:.1f} ms cumulative, {len(modules)} modules")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # First launch creates the database and cycle; the timed launches are warm-schema cold starts.
+        subprocess.run([sys.executable, SCRIPT], cwd=tmp, input="1000\n4\n", capture_output=True, text=True, check=True)
+        samples = [time_to_menu(tmp) for _ in range(args.runs)]
+    median_ms = statistics.median(samples) * 1000
+    print(f"cold start to menu: median {median_ms:.1f} ms over {args.runs} runs (budget {args.budget_ms:.0f} ms)")
+
+    failed = False
+    if heavy:
+        print(f"❌ matplotlib imported at startup: {', '.join(heavy[:5])}")
+        failed = True
+    if median_ms > args.budget_ms:
+        print("❌ cold start exceeds budget")
+        failed = True
+    if failed:
+        sys.exit(1)
+    print("✅ startup within budget")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Per-call cost of the budget_stats instrumentation: undecorated vs disabled vs enabled."""
+import argparse
+import os
+import tempfile
+import time
+
+import budget_stats
+import budget_tracker as bt
+
+def per_call_us(fn, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - start) / calls * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--calls", type=int, default=50_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bt.DB_NAME = os.path.join(tmp, "bench.db")
+        bt.init_db()
+        cycle_id = bt.start_new_cycle(5000.0)
+        bt.add_transaction(cycle_id, 'expense', 12.5, "Food", "Bench", quiet=True)
+
+        per_call_us(lambda: bt.calculate_burn_rate(cycle_id), args.calls // 10)  # Warm-up
+        raw = per_call_us(lambda: bt.calculate_burn_rate.__wrapped__(cycle_id), args.calls)
+        disabled = per_call_us(lambda: bt.calculate_burn_rate(cycle_id), args.calls)
+        bt.close_connections()
+        budget_stats.enable()
+        enabled = per_call_us(lambda: bt.calculate_burn_rate(cycle_id), args.calls)
+        budget_stats.disable()
+        bt.close_connections()
+
+    print(f"calculate_burn_rate, {args.calls:,} calls:")
+    print(f"  undecorated        {raw:8.2f} us/call")
+    print(f"  stats disabled     {disabled:8.2f} us/call  (+{disabled - raw:.2f} us)")
+    print(f"  stats enabled      {enabled:8.2f} us/call  (+{enabled - raw:.2f} us, function and SQL timed)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""add_transaction throughput with write-behind at several batch windows vs a commit per call.
+
+    python -m benchmarks.bench_write_behind --rows 2000 --windows 1,5,20,100
+
+Rows are added one at a time, like a sync job pushing card transactions, on a
+fresh database with the given pragma profile ("durable" fsyncs every commit).
+"durable p99" is how long a row waited between add_transaction and the commit
+that made it durable (on_commit).
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import budget_tracker as bt
+
+def run(rows, window_ms, max_rows, rate):
+    cycle_id = bt.start_new_cycle(1000.0)
+    queued, waits = [], []
+
+    def on_commit(batch):
+        now = time.perf_counter()
+        waits.extend(now - queued[int(row[4])] for row in batch)
+
+    buffer = None if window_ms is None else bt.enable_write_behind(max_rows, window_ms, on_commit)
+    interval = 1 / rate if rate else 0
+    start = time.perf_counter()
+    for i in range(rows):
+        if interval:
+            time.sleep(max(start + i * interval - time.perf_counter(), 0))
+        queued.append(time.perf_counter())
+        bt.add_transaction(cycle_id, 'expense', 4.5, "Dining", str(i), quiet=True)
+        if buffer is None:
+            waits.append(time.perf_counter() - queued[-1])
+    commits = rows
+    if buffer is not None:
+        buffer.flush()
+        commits = buffer.commits
+        bt.disable_write_behind()
+    elapsed = time.perf_counter() - start
+    waits.sort()
+    return elapsed, commits, waits[min(int(0.99 * len(waits)), len(waits) - 1)] * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--windows", default="1,5,20,100", help="Comma-separated max_delay_ms values")
+    parser.add_argument("--max-rows", type=int, default=bt.WRITE_BEHIND_ROWS, help="Rows that force a commit")
+    parser.add_argument("--rate", type=float, default=0, help="Rows/s offered by the producer (0: flat out)")
+    parser.add_argument("--profile", choices=sorted(bt.PRAGMA_PROFILES), default="durable")
+    parser.add_argument("--dir", help="Where to create the database (default: the temp dir, often tmpfs)")
+    args = parser.parse_args()
+
+    print(f"{args.rows:,} rows, profile {args.profile}" + (f", {args.rate:,.0f} rows/s offered" if args.rate else ""))
+    print(f"{'mode':<18}{'rows/s':>12}{'commits':>10}{'speedup':>10}{'durable p99 ms':>16}")
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        bt.DB_NAME = os.path.join(tmp, "bench.db")
+        bt.init_db(args.profile)
+        baseline = None
+        for window in [None] + [float(w) for w in args.windows.split(",")]:
+            elapsed, commits, p99 = run(args.rows, window, args.max_rows, args.rate)
+            rate = args.rows / elapsed
+            baseline = baseline or rate
+            label = "commit per call" if window is None else f"window {window:g} ms"
+            print(f"{label:<18}{rate:>12,.0f}{commits:>10,}{rate / baseline:>9.1f}x{p99:>16.2f}")
+        bt.close_connections()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
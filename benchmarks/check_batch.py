@@ -0,0 +1,52 @@
+"""Fails (exit 1) if a failing --batch command undoes commands that were already acknowledged."""
+import io
+import json
+import os
+import sys
+import tempfile
+
+import budget_tracker as bt
+
+# Each failing command sits between adds that must all be committed.
+FAILING = (
+    {"cmd": "import", "file": "missing.csv"},
+    {"cmd": "stats", "file": "missing.json"},
+    {"cmd": "add", "amount": "abc"},
+    {"cmd": "add", "amount": 10 ** 30},  # OverflowError: too large for an SQLite INTEGER
+    {"cmd": "add", "amount": 1, "cycle_id": 99},
+    {"cmd": "nope"},
+)
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        bt.DB_NAME = os.path.join(tmp, "batch.db")
+        bt.init_db()
+        cycle_id = bt.start_new_cycle(1000.0)
+        lines = [json.dumps({"cmd": "add", "amount": 2, "category": "Batch"})]
+        for command in FAILING:
+            lines += [json.dumps(command), json.dumps({"cmd": "add", "amount": 2, "category": "Batch"})]
+        out = io.StringIO()
+        try:
+            failures = bt.run_batch(lines, out)
+        except Exception as e:
+            failures = None
+            print(f"run_batch raised {type(e).__name__}: {e}")
+        bt.close_connections()  # Drop the cached rows; read back what was committed
+        results = [json.loads(line) for line in out.getvalue().splitlines()]
+        acked = sum(1 for result in results if result["ok"])
+        stored = dict(bt.get_category_totals(cycle_id)).get("Batch", 0) / 2
+        bt.close_connections()
+
+    print(out.getvalue(), end="")
+    problems = []
+    if failures != len(FAILING):
+        problems.append(f"{failures} commands failed, expected {len(FAILING)}")
+    if stored != acked:
+        problems.append(f"{acked} adds acknowledged but {stored:g} committed")
+    if problems:
+        print("❌ " + "\n❌ ".join(problems))
+        sys.exit(1)
+    print(f"✅ All {acked} acknowledged commands were committed.")
+
+if __name__ == "__main__":
+    main()
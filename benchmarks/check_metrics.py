@@ -0,0 +1,55 @@
+"""Scrapes budget_metrics.serve() on localhost and fails (exit 1) if the exposition is wrong."""
+import os
+import re
+import sys
+import tempfile
+import urllib.request
+
+import budget_metrics
+import budget_tracker as bt
+
+SAMPLE = re.compile(r'^[a-zA-Z_:][a-zA-Z0-9_:]*(\{[a-zA-Z_][a-zA-Z0-9_]*="[^"]*"\})? -?[0-9.e+-]+$')
+EXPECTED = ("budget_transactions_inserted_total", "budget_commit_duration_seconds_count",
+            "budget_burn_rate_duration_seconds_count", "budget_chart_render_duration_seconds_count",
+            "budget_db_size_bytes", "budget_wal_size_bytes")
+
+def scrape(port):
+    with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as response:
+        assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+        return response.read().decode()
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        bt.DB_NAME = os.path.join(tmp, "metrics.db")
+        bt.REPORT_PATH = os.path.join(tmp, "report_{cycle_id}.png")
+        bt.CHART_CACHE_DIR = os.path.join(tmp, "cache")
+        bt.init_db()
+        server = budget_metrics.serve(0)
+        try:
+            before = scrape(server.server_port)
+            cycle_id = bt.start_new_cycle(2000.0)
+            bt.add_transaction(cycle_id, 'expense', 12.5, "Food", "Check", quiet=True)
+            bt.add_transactions(cycle_id, [('expense', 3, "Transport", "Bus", None)] * 10)
+            bt.calculate_burn_rate(cycle_id)
+            bt.generate_visual_report(cycle_id, quiet=True)
+            after = scrape(server.server_port)
+        finally:
+            server.shutdown()
+            bt.close_connections()
+
+    values = lambda text: dict(line.rsplit(" ", 1) for line in text.splitlines() if not line.startswith("#"))
+    problems = [f"malformed line: {line!r}" for line in after.splitlines()
+                if not line.startswith("#") and not SAMPLE.match(line)]
+    problems += [f"missing {name}" for name in EXPECTED if name not in values(after)]
+    inserted = float(values(after)["budget_transactions_inserted_total"]) - \
+        float(values(before)["budget_transactions_inserted_total"])
+    if inserted != 12:
+        problems.append(f"budget_transactions_inserted_total grew by {inserted}, expected 12")
+    print(after)
+    if problems:
+        print("❌ " + "\n❌ ".join(problems))
+        sys.exit(1)
+    print("✅ Metrics endpoint serves valid Prometheus text.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+"""Fails (exit 1) if any hot query in budget_tracker.HOT_QUERIES scans transactions without an index."""
+import os
+import sys
+import tempfile
+
+import budget_tracker as bt
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        bt.DB_NAME = os.path.join(tmp, "plans.db")
+        bt.init_db()
+        conn = bt.get_connection()
+        for name, (sql, params) in bt.HOT_QUERIES.items():
+            print(f"{name}:")
+            for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params):
+                print(f"    {row[3]}")
+        failures = bt.check_query_plans()
+        bt.close_connections()
+
+    if failures:
+        print(f"\n❌ Unindexed hot queries: {', '.join(failures)}")
+        sys.exit(1)
+    print("\n✅ Every hot query uses an index.")
+
+if __name__ == "__main__":
+    main()
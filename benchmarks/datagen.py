@@ -0,0 +1,110 @@
+"""Seeded generator for realistic finance databases: N cycles x M transactions.
+
+The same (cycles, per_cycle, seed) always produces the same rows, so benchmark
+runs on different commits compare like with like. Run directly to build one:
+
+    python -m benchmarks.datagen --cycles 12 --per-cycle 500 --out demo.db
+"""
+import argparse
+import math
+import os
+import random
+import time
+from datetime import date, datetime, timedelta
+
+import budget_tracker as bt
+
+DEFAULT_SEED = 20240101
+CYCLE_DAYS = 30
+LAST_CYCLE_START = date(2025, 6, 1)  # Fixed, so a dataset does not depend on the day it was built
+
+# category: (share of expense rows, lognormal mu, sigma) of the amount in dollars.
+# Medians come out near e**mu: groceries ~$45, dining ~$22, rent ~$1,200.
+SPENDING_PROFILE = {
+    "Groceries": (0.24, 3.8, 0.6),
+    "Dining": (0.18, 3.1, 0.5),
+    "Transport": (0.16, 2.6, 0.7),
+    "Shopping": (0.12, 3.7, 0.9),
+    "Entertainment": (0.08, 3.2, 0.7),
+    "Utilities": (0.06, 4.4, 0.4),
+    "Health": (0.05, 3.9, 0.8),
+    "Subscriptions": (0.05, 2.5, 0.4),
+    "Misc": (0.05, 2.8, 1.0),
+    "Rent": (0.01, 7.1, 0.1),
+}
+INCOME_SHARE = 0.02  # Refunds, transfers and side income among the generated rows
+
+def cycles_for(rows):
+    """Splits a row budget into (cycles, per_cycle): monthly cycles, at most ten years."""
+    cycles = min(max(rows // 20_000, 1), 120)
+    return cycles, max(rows // cycles, 1)
+
+def generate_rows(rng, start, count):
+    """Yields `count` (type, amount, category, description, timestamp) rows within one cycle."""
+    categories = list(SPENDING_PROFILE)
+    weights = [share for share, _, _ in SPENDING_PROFILE.values()]
+    # Pre-format one timestamp per 15-minute slot instead of one per row.
+    slots = [(start + timedelta(minutes=15 * i)).isoformat() for i in range(CYCLE_DAYS * 96)]
+    picks = rng.choices(categories, weights, k=count)
+    for category in picks:
+        if rng.random() < INCOME_SHARE:
+            yield ('income', round(rng.lognormvariate(4.5, 1.0), 2), "Refund", "Transfer in", rng.choice(slots))
+            continue
+        _, mu, sigma = SPENDING_PROFILE[category]
+        amount = max(round(rng.lognormvariate(mu, sigma), 2), 0.01)
+        yield ('expense', amount, category, f"{category} #{rng.randrange(200)}", rng.choice(slots))
+
+def build_database(path, cycles, per_cycle, seed=DEFAULT_SEED):
+    """Creates a fresh database at `path` with consecutive cycles ending at LAST_CYCLE_START."""
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    bt.DB_NAME = path
+    bt.init_db("bulk-load")
+    rng = random.Random(seed)
+    mean_spend = sum(share * math.exp(mu + sigma ** 2 / 2)
+                     for share, mu, sigma in SPENDING_PROFILE.values())
+    first = LAST_CYCLE_START - timedelta(days=CYCLE_DAYS * (cycles - 1))
+    for n in range(cycles):
+        start = first + timedelta(days=CYCLE_DAYS * n)
+        end = start + timedelta(days=CYCLE_DAYS)
+        income = bt.to_cents(round(per_cycle * mean_spend * rng.uniform(0.9, 1.3), 2))
+        moment = datetime.combine(start, datetime.min.time())
+        with bt.transaction() as conn:
+            cycle_id = conn.execute("""INSERT INTO cycles (start_date, end_date, initial_income, start_day, end_day)
+                                       VALUES (?, ?, ?, ?, ?)""",
+                                    (start.isoformat(), end.isoformat(), income,
+                                     bt.to_day(start), bt.to_day(end))).lastrowid
+            conn.execute(bt.INSERT_TRANSACTION_SQL, (cycle_id, 'income', 'Salary', income, 'Initial Cycle Funds',
+                                                     moment.isoformat(), bt.to_epoch(moment)))
+            bt.add_transactions(cycle_id, generate_rows(rng, moment, per_cycle - 1))
+    bt.close_connections()
+    bt.init_db()  # Back to the default pragma profile
+    bt.close_connections()
+    return path
+
+def dataset(rows, directory, seed=DEFAULT_SEED, fresh=False):
+    """Path to a cached database of about `rows` transactions, building it if needed."""
+    cycles, per_cycle = cycles_for(rows)
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"finance_{cycles}x{per_cycle}_s{seed}_v{bt.SCHEMA_VERSION}.db")
+    if fresh or not os.path.exists(path):
+        build_database(path + ".tmp", cycles, per_cycle, seed)
+        os.replace(path + ".tmp", path)
+    return path
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cycles", type=int, default=12)
+    parser.add_argument("--per-cycle", type=int, default=1000, help="Transactions per cycle")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--out", default="synthetic.db")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    build_database(args.out, args.cycles, args.per_cycle, args.seed)
+    print(f"Wrote {args.cycles * args.per_cycle:,} transactions in {args.cycles} cycles to {args.out}"
+          f" ({time.perf_counter() - start:.1f}s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""Times every public budget_tracker function on seeded datasets and writes JSON results.
+
+    python -m benchmarks.suite                              # 1K, 100K and 10M rows
+    python -m benchmarks.suite --sizes 1k,100k -o new.json
+    python -m benchmarks.suite --sizes 1k,100k --compare baseline.json
+
+Datasets come from benchmarks.datagen and are cached in --data-dir, so only the
+first run at a size pays for generating it. Writes run inside a transaction
+that is rolled back, so every run sees the same rows. With --compare, any
+function whose fastest run got slower than the baseline's by more than
+--threshold, plus the run-to-run spread of both runs, is reported and the exit
+status is 1.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import budget_tracker as bt
+from benchmarks import datagen
+
+DEFAULT_SIZES = "1k,100k,10m"
+ROUNDS = 3  # Passes over the whole list, so a slow patch on the machine can't cover every run of one benchmark
+MIN_TIME = 0.15  # Seconds of repeated runs per benchmark and round, after one warm-up call
+MAX_RUNS = 70
+MIN_RUNS = 4
+NOISE_FACTOR = 3  # Slowdowns within this many spreads of either run are noise
+
+class _Rollback(Exception):
+    pass
+
+def rolled_back(fn):
+    """Wraps a writing call so its changes are undone after it is timed."""
+    def run():
+        try:
+            with bt.transaction():
+                fn()
+                raise _Rollback
+        except _Rollback:
+            pass
+    return run
+
+def uncached(fn):
+    """Runs a read with the query result cache turned off."""
+    def run():
+        saved, bt.QUERY_CACHE_BYTES = bt.QUERY_CACHE_BYTES, 0
+        try:
+            fn()
+        finally:
+            bt.QUERY_CACHE_BYTES = saved
+    return run
+
+def parse_size(text):
+    text = text.strip().lower()
+    scale = {"k": 1_000, "m": 1_000_000}.get(text[-1:], 1)
+    return int(float(text.rstrip("km")) * scale)
+
+def benchmarks():
+    """(name, callable) pairs covering the public API, against the current dataset."""
+    cycle = bt.get_current_cycle()
+    cycle_id, cycle_start = cycle[0], datetime.fromisoformat(cycle[1])
+    month = (cycle_start, cycle_start + timedelta(days=29))
+    week = (cycle_start + timedelta(days=7), cycle_start + timedelta(days=13))
+    rows = list(datagen.generate_rows(random.Random(0), cycle_start, 1000))
+
+    def chart_cold():
+        bt.get_chart_cache().clear()
+        bt.generate_visual_report(cycle_id, quiet=True)
+
+    return [
+        ("init_db", bt.init_db),
+        ("get_current_cycle", bt.get_current_cycle),
+        ("calculate_burn_rate", lambda: bt.calculate_burn_rate(cycle_id)),
+        ("calculate_burn_rates", bt.calculate_burn_rates),
+        ("get_category_totals", lambda: bt.get_category_totals(cycle_id)),
+        ("spend_between", lambda: bt.spend_between(*month)),
+        ("category_spend_between", lambda: bt.category_spend_between(*month)),
+        ("spend_between_uncached", uncached(lambda: bt.spend_between(*month))),
+        ("category_spend_between_uncached", uncached(lambda: bt.category_spend_between(*month))),
+        ("transactions_between", lambda: sum(1 for _ in bt.transactions_between(*week))),
+        ("check_cycle_totals", bt.check_cycle_totals),
+        ("check_query_plans", bt.check_query_plans),
+        ("generate_visual_report", lambda: bt.generate_visual_report(cycle_id, quiet=True)),
+        ("generate_visual_report_uncached", chart_cold),
+        ("add_transaction", rolled_back(lambda: bt.add_transaction(cycle_id, 'expense', 4.5, "Dining", "Bench",
+                                                                   quiet=True))),
+        ("add_transactions_1k", rolled_back(lambda: bt.add_transactions(cycle_id, rows))),
+        ("start_new_cycle", rolled_back(lambda: bt.start_new_cycle(2500.0))),
+        ("rebuild_cycle_totals", rolled_back(bt.rebuild_cycle_totals)),
+        ("to_cents", lambda: bt.to_cents("1234.56")),
+        ("to_epoch", lambda: bt.to_epoch("2025-06-01T12:30:00")),
+    ]
+
+def measure(fn):
+    """Returns the times in milliseconds of repeated calls of fn()."""
+    fn()  # Warm caches and lazy imports
+    samples = []
+    deadline = time.perf_counter() + MIN_TIME
+    while len(samples) < MAX_RUNS and (len(samples) < MIN_RUNS or time.perf_counter() < deadline):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+def summarize(samples):
+    """Timing stats in milliseconds for one benchmark's samples."""
+    median = statistics.median(samples)
+    # Median absolute deviation: how far a typical run lands from the median
+    spread = statistics.median(abs(sample - median) for sample in samples)
+    return {"median_ms": median, "min_ms": min(samples), "spread_ms": spread, "runs": len(samples)}
+
+def run_size(rows, args):
+    path = datagen.dataset(rows, args.data_dir, args.seed, args.fresh)
+    bt.DB_NAME = path
+    bt.init_db()
+    samples = {}
+    with tempfile.TemporaryDirectory() as chart_dir:
+        saved = bt.CHART_CACHE_DIR, bt.REPORT_PATH
+        bt.CHART_CACHE_DIR = os.path.join(chart_dir, "cache")
+        bt.REPORT_PATH = os.path.join(chart_dir, "report_{cycle_id}.png")
+        try:
+            cases = [(name, fn) for name, fn in benchmarks() if not args.only or name in args.only]
+            for _ in range(ROUNDS):
+                for name, fn in cases:
+                    samples.setdefault(name, []).extend(measure(fn))
+            results = {name: summarize(samples[name]) for name, _ in cases}
+            for name, stats in results.items():
+                print(f"  {name:<34}{stats['median_ms']:>12.3f} ms", file=sys.stderr)
+        finally:
+            bt.CHART_CACHE_DIR, bt.REPORT_PATH = saved
+            bt.close_connections()
+            bt.close_renderer()
+    return results
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(results, baseline, threshold, min_delta_ms):
+    """Returns (size, name, baseline_ms, current_ms) for every regression beyond threshold.
+
+    Compares the fastest runs, which only move when the code does; medians also
+    pick up whatever else the machine was doing. The allowed slowdown widens by
+    NOISE_FACTOR times the larger run-to-run spread, so benchmarks that jitter a
+    lot need a bigger change to be flagged.
+    """
+    regressions = []
+    for size, cases in results["results"].items():
+        for name, stats in cases.items():
+            old = baseline["results"].get(size, {}).get(name)
+            if old is None:
+                continue
+            key = "min_ms" if "min_ms" in old else "median_ms"
+            before, after = old[key], stats[key]
+            noise = NOISE_FACTOR * max(old.get("spread_ms", 0), stats["spread_ms"])
+            if after - before > max(before * threshold + noise, min_delta_ms):
+                regressions.append((size, name, before, after))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"Comma-separated row counts (default: {DEFAULT_SIZES})")
+    parser.add_argument("--only", type=lambda s: set(s.split(",")), help="Comma-separated benchmark names")
+    parser.add_argument("--seed", type=int, default=datagen.DEFAULT_SEED)
+    parser.add_argument("--data-dir", default=".bench_data", help="Where generated databases are cached")
+    parser.add_argument("--fresh", action="store_true", help="Regenerate cached datasets")
+    parser.add_argument("-o", "--output", default="bench_results.json")
+    parser.add_argument("--compare", metavar="BASELINE", help="Results JSON to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown (default: 0.25 = 25%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=0.05, help="Ignore slowdowns smaller than this")
+    args = parser.parse_args()
+
+    results = {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "schema_version": bt.SCHEMA_VERSION,
+            "seed": args.seed,
+        },
+        "results": {},
+    }
+    for size in args.sizes.lower().replace(" ", "").split(","):
+        print(f"{size} rows:", file=sys.stderr)
+        results["results"][size] = run_size(parse_size(size), args)
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold, args.min_delta_ms)
+        for size, name, before, after in regressions:
+            print(f"❌ {size:>6} {name:<34}{before:>10.3f} ms -> {after:>10.3f} ms  (+{after / before - 1:.0%})")
+        if regressions:
+            return 1
+        print(f"✅ No regressions beyond {args.threshold:.0%} against {args.compare}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
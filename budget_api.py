@@ -0,0 +1,322 @@
+"""HTTP JSON API for budget_tracker, on the standard library only.
+
+Start it with `python3 budget_tracker.py api --port 8765`; it binds to
+localhost. Reads run concurrently on a pool of read-only connections, which in
+WAL mode never wait for the writer. Every write goes through one writer thread
+that commits whatever has queued up in a single transaction (group commit),
+so concurrent POSTs share one fsync instead of queueing on the write lock.
+
+    GET  /cycles                          every cycle with its forecast
+    GET  /cycles/current                  forecast and categories of the newest cycle
+    GET  /cycles/{id}                     forecast and categories of one cycle
+    GET  /cycles/{id}/burn-rate           {"balance", "daily_rate", "runway"}
+    GET  /cycles/{id}/categories          {category: total}
+    GET  /cycles/{id}/chart               the category pie chart as image/png
+    GET  /transactions?start=&end=&type=&limit=
+    GET  /metrics                         Prometheus text format
+    POST /transactions                    {"amount", "category", "type", "description", "cycle_id"}
+    POST /transactions/bulk               {"rows": [[type, amount, category, description, timestamp]], "cycle_id"}
+    POST /cycles                          {"income", "rollover"}
+
+A write is acknowledged only after the transaction holding it has committed.
+Errors come back as {"error": message}: 400 for invalid input, 404 for an
+unknown route or cycle, 409 when the write conflicts with a database
+constraint, and 500 for server faults.
+"""
+import json
+import os
+import queue
+import signal
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import islice
+from urllib.parse import parse_qs, urlsplit
+
+import budget_metrics
+import budget_tracker as bt
+
+API_PORT = 8765
+API_POOL_SIZE = 16  # Read-only connections kept for request threads
+GROUP_COMMIT_MAX = 256  # Writes committed together at most
+GROUP_COMMIT_WAIT = 0.0  # Seconds the writer lingers for more writes; 0 commits whatever is queued
+TRANSACTIONS_LIMIT = 100  # Default and maximum (x10) rows of GET /transactions
+MAX_BODY_BYTES = 16 * 2**20
+CLIENT_ERRORS = (ValueError, TypeError)
+
+GROUP_COMMIT_SIZE = bt.METRICS.histogram("budget_api_group_commit_size", "Writes committed per API transaction",
+                                         buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256))
+REQUEST_SECONDS = bt.METRICS.histogram("budget_api_request_seconds", "API request latency")
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+# --- Writer ---
+
+class WriteQueue:
+    """Runs write callables on a single thread, committing each drained group together.
+
+    Every write runs in its own SAVEPOINT, so one that raises is rolled back and
+    reported to its caller alone while the rest of the group still commits.
+    """
+
+    def __init__(self, max_group=GROUP_COMMIT_MAX, wait=GROUP_COMMIT_WAIT):
+        self.max_group = max_group
+        self.wait = wait
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="api-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, fn, *args, **kwargs):
+        """Queues fn(*args, **kwargs); the Future resolves once its transaction has committed."""
+        future = Future()
+        self._queue.put((fn, args, kwargs, future))
+        return future
+
+    def call(self, fn, *args, **kwargs):
+        return self.submit(fn, *args, **kwargs).result()
+
+    def close(self):
+        """Commits what is queued, then stops the writer thread."""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _next_group(self):
+        group = [self._queue.get()]
+        deadline = time.monotonic() + self.wait
+        while group[-1] is not None and len(group) < self.max_group:
+            try:
+                timeout = deadline - time.monotonic()
+                group.append(self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return group
+
+    def _run(self):
+        while True:
+            group = self._next_group()
+            stop = group[-1] is None
+            if stop:
+                group.pop()
+            if group:
+                self._commit(group)
+            if stop:
+                return
+
+    def _commit(self, group):
+        outcomes = []
+        try:
+            with bt.transaction() as conn:
+                if not conn.in_transaction:
+                    conn.execute("BEGIN IMMEDIATE")  # Or the first RELEASE below would commit on its own
+                for fn, args, kwargs, future in group:
+                    conn.execute("SAVEPOINT api_write")
+                    try:
+                        outcomes.append((future, fn(*args, **kwargs), None))
+                    except Exception as e:
+                        conn.execute("ROLLBACK TO api_write")
+                        outcomes.append((future, None, e))
+                    conn.execute("RELEASE api_write")
+        except Exception as e:  # The commit itself failed: none of the group is durable
+            for *_, future in group:
+                future.set_exception(e)
+            return
+        GROUP_COMMIT_SIZE.observe(len(group))
+        for future, result, error in outcomes:
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+
+# --- Endpoints ---
+
+def _cycle_id(text):
+    if text == "current":
+        return bt._cycle_or_current(None)
+    try:
+        cycle_id = int(text)
+    except ValueError:
+        raise ApiError(404, f"No cycle {text!r}") from None
+    return bt._cycle_or_current(cycle_id)
+
+def _forecast(cycle_id):
+    bal, rate, runway = bt.calculate_burn_rate(cycle_id)
+    return {"cycle_id": cycle_id, "balance": bal, "daily_rate": rate, "runway": runway}
+
+def list_cycles(api, query):
+    conn = bt.get_connection()
+    conn.execute("BEGIN")  # One snapshot: a cycle committed between the reads would have no forecast
+    try:
+        cycles, rates = bt.get_cycles(), bt.calculate_burn_rates()
+    finally:
+        conn.rollback()
+    return [{"cycle_id": cid, "start_date": start, "end_date": end, "initial_income": income,
+             "balance": rates[cid][0], "daily_rate": rates[cid][1], "runway": rates[cid][2]}
+            for cid, start, end, income in cycles]
+
+def get_cycle(api, query, cycle):
+    cycle_id = _cycle_id(cycle)
+    (bal, rate, runway), categories = bt.cycle_report(cycle_id)
+    return {"cycle_id": cycle_id, "balance": bal, "daily_rate": rate, "runway": runway,
+            "categories": dict(categories)}
+
+def get_burn_rate(api, query, cycle):
+    return _forecast(_cycle_id(cycle))
+
+def get_categories(api, query, cycle):
+    return dict(bt.get_category_totals(_cycle_id(cycle)))
+
+def get_chart(api, query, cycle):
+    # Served straight from the chart cache: a shared per-cycle report file could be read mid-copy.
+    path = bt.chart_file(_cycle_id(cycle))
+    if path is None:
+        raise ApiError(404, "No expenses found for this cycle")
+    with open(path, "rb") as f:
+        return f.read(), "image/png"
+
+def get_transactions(api, query):
+    end = date.fromisoformat(query["end"]) if "end" in query else date.today()
+    start = date.fromisoformat(query["start"]) if "start" in query else end - timedelta(days=30)
+    limit = min(int(query.get("limit", TRANSACTIONS_LIMIT)), TRANSACTIONS_LIMIT * 10)
+    rows = islice(bt.transactions_between(start, end, query.get("type")), limit)
+    return [dict(zip(("id", "cycle_id", "type", "category", "amount", "description", "timestamp"), row))
+            for row in rows]
+
+def get_metrics(api, query):
+    return bt.METRICS.render().encode(), budget_metrics.CONTENT_TYPE
+
+def post_transaction(api, body):
+    return api.writer.call(bt.cmd_add, **body)
+
+def post_transactions_bulk(api, body):
+    return api.writer.call(bt.cmd_bulk_add, **body)
+
+def post_cycle(api, body):
+    return api.writer.call(bt.cmd_new_cycle, **body)
+
+ROUTES = {
+    ("GET", ("cycles",)): list_cycles,
+    ("GET", ("cycles", "*")): get_cycle,
+    ("GET", ("cycles", "*", "burn-rate")): get_burn_rate,
+    ("GET", ("cycles", "*", "categories")): get_categories,
+    ("GET", ("cycles", "*", "chart")): get_chart,
+    ("GET", ("transactions",)): get_transactions,
+    ("GET", ("metrics",)): get_metrics,
+    ("POST", ("transactions",)): post_transaction,
+    ("POST", ("transactions", "bulk")): post_transactions_bulk,
+    ("POST", ("cycles",)): post_cycle,
+}
+
+def route(method, parts):
+    """Returns (handler, path arguments) for a request, or raises ApiError."""
+    allowed = []
+    for (verb, pattern), handler in ROUTES.items():
+        if len(pattern) == len(parts) and all(p in ("*", part) for p, part in zip(pattern, parts)):
+            if verb == method:
+                return handler, [part for p, part in zip(pattern, parts) if p == "*"]
+            allowed.append(verb)
+    if allowed:
+        raise ApiError(405, f"{method} not allowed; use {', '.join(allowed)}")
+    raise ApiError(404, f"No route for /{'/'.join(parts)}")
+
+# --- Server ---
+
+class ApiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive; every response carries Content-Length
+    server_version = "BudgetTracker"
+    disable_nagle_algorithm = True  # Headers and body go out in separate writes; don't wait 40 ms for an ACK
+
+    def do_GET(self):
+        self.dispatch("GET")
+
+    def do_POST(self):
+        self.dispatch("POST")
+
+    def dispatch(self, method):
+        start = time.perf_counter()
+        url = urlsplit(self.path)
+        try:
+            handler, path_args = route(method, [part for part in url.path.split("/") if part])
+            if method == "POST":
+                result = handler(self.server, self.read_json())
+                status = 201
+            else:
+                query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+                with bt.get_manager().pooled(readonly=True):
+                    result = handler(self.server, query, *path_args)
+                status = 200
+        except ApiError as e:
+            status, result = e.status, {"error": str(e)}
+        except bt.CycleNotFound as e:
+            status, result = 404, {"error": str(e)}
+        except CLIENT_ERRORS as e:
+            status, result = 400, {"error": f"{type(e).__name__}: {e}"}
+        except sqlite3.IntegrityError as e:
+            status, result = 409, {"error": f"{type(e).__name__}: {e}"}
+        except Exception as e:  # Database errors and bugs alike; answer rather than drop the connection
+            status, result = 500, {"error": f"{type(e).__name__}: {e}"}
+        if isinstance(result, tuple):
+            body, content_type = result
+        else:
+            body, content_type = json.dumps(result, default=str).encode(), "application/json"
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        REQUEST_SECONDS.observe(time.perf_counter() - start)
+
+    def read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            raise ApiError(413, f"Request body over {MAX_BODY_BYTES} bytes")
+        body = json.loads(self.rfile.read(length) or b"{}")
+        if not isinstance(body, dict):
+            raise ValueError("Request body must be a JSON object")
+        return body
+
+    def log_message(self, format, *args):
+        pass  # One line per request would cost more than most requests
+
+class ApiServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, address):
+        super().__init__(address, ApiHandler)
+        self.writer = WriteQueue()
+
+    def server_close(self):
+        super().server_close()
+        self.writer.close()
+
+def serve(port=API_PORT, host="127.0.0.1"):
+    """Serves the API until SIGTERM/SIGINT; returns the exit status."""
+    bt.CHART_CACHE_DIR = os.path.abspath(bt.CHART_CACHE_DIR)
+    bt.ACTIVE_CYCLE_CACHE = True
+    bt.FORECAST_CACHE = True
+    bt.POOL_SIZE = max(bt.POOL_SIZE, API_POOL_SIZE)
+    bt.close_connections()  # Reopen the manager with the larger pool
+    bt.init_db()
+    bt.close_connections()  # The writer thread opens its own connection
+    bt.get_renderer()
+
+    server = ApiServer((host, port))
+    signal.signal(signal.SIGTERM, lambda signum, frame: threading.Thread(target=server.shutdown).start())
+    print(f"🟢 Serving {bt.DB_NAME} on http://{host}:{server.server_port}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        bt.close_renderer()
+    print("🔴 API stopped.", file=sys.stderr)
+    return 0
@@ -0,0 +1,96 @@
+"""asyncio facade over the core budget_tracker functions.
+
+sqlite3 and matplotlib block, so calling budget_tracker from a coroutine
+stalls the event loop for every commit and chart. AsyncTracker runs all
+database work on one dedicated thread, which owns its connection and keeps
+statements in submission order, and renders charts in a process pool so a
+cache miss does not hold the GIL while the loop is trying to run:
+
+    async with AsyncTracker() as tracker:
+        cycle = await tracker.get_current_cycle()
+        await tracker.add_transaction(cycle[0], 'expense', 12.5, "Food", "Lunch")
+        bal, rate, runway = await tracker.calculate_burn_rate(cycle[0])
+        path = await tracker.generate_visual_report(cycle[0])
+"""
+import asyncio
+import functools
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import budget_tracker as bt
+
+CHART_WORKERS = 1  # Processes rendering charts; each imports matplotlib on its first render
+
+def _lookup_chart(cycle_id):
+    # Database half of generate_visual_report, on the DB thread.
+    job = bt.chart_job(cycle_id)
+    if job is None:
+        return None, None
+    cached = bt.get_chart_cache().get(job[0])
+    if cached is not None:
+        bt.CHART_CACHE_HITS.inc()
+    return job, cached
+
+def _render_chart(cache_dir, key, labels, values, title):
+    # Runs in a chart worker process; renders into the shared on-disk cache.
+    bt.CHART_CACHE_DIR = cache_dir
+    return bt.render_chart(key, labels, values, title)
+
+class AsyncTracker:
+    """Awaitable versions of the core tracker functions, against budget_tracker.DB_NAME."""
+
+    def __init__(self, chart_workers=CHART_WORKERS):
+        self.chart_workers = chart_workers
+        self._db = ThreadPoolExecutor(max_workers=1, thread_name_prefix="budget-db")
+        self._charts = None
+
+    async def __aenter__(self):
+        await self.init_db()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def run(self, fn, *args, **kwargs):
+        """Runs fn(*args, **kwargs) on the DB thread and returns its result."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._db, functools.partial(fn, *args, **kwargs))
+
+    async def init_db(self, profile=None):
+        return await self.run(bt.init_db, profile)
+
+    async def get_current_cycle(self):
+        return await self.run(bt.get_current_cycle)
+
+    async def start_new_cycle(self, income, rollover=0.0):
+        return await self.run(bt.start_new_cycle, income, rollover)
+
+    async def add_transaction(self, cycle_id, t_type, amount, category, desc=""):
+        return await self.run(bt.add_transaction, cycle_id, t_type, amount, category, desc, quiet=True)
+
+    async def calculate_burn_rate(self, cycle_id):
+        return await self.run(bt.calculate_burn_rate, cycle_id)
+
+    async def generate_visual_report(self, cycle_id):
+        """Writes the cycle's chart to REPORT_PATH and returns its path, or None without expenses."""
+        job, cached = await self.run(_lookup_chart, cycle_id)
+        if job is None:
+            return None
+        if cached is None:
+            if self._charts is None:
+                self._charts = ProcessPoolExecutor(max_workers=self.chart_workers)
+            loop = asyncio.get_running_loop()
+            cached = await loop.run_in_executor(self._charts, _render_chart,
+                                                os.path.abspath(bt.CHART_CACHE_DIR), *job)
+        path = bt.REPORT_PATH.format(cycle_id=cycle_id)
+        await self.run(shutil.copyfile, cached, path)
+        return path
+
+    async def close(self):
+        """Closes the DB thread's connection and shuts both executors down."""
+        await self.run(bt.get_manager().release)
+        self._db.shutdown()
+        if self._charts is not None:
+            self._charts.shutdown()
+            self._charts = None
@@ -0,0 +1,94 @@
+"""Thin client for the budget_tracker daemon (see budget_daemon.py).
+
+Takes the same command line as budget_tracker.py and forwards it over the
+Unix socket, so only the interpreter starts here; the database, caches and
+matplotlib stay warm in the daemon.
+
+    python3 budget_tracker.py daemon &
+    python3 budget_client.py burn-rate
+    python3 budget_client.py --json report
+    python3 budget_client.py --batch < commands.jsonl
+    python3 budget_client.py --socket /tmp/finance.sock add 12.50 Food
+
+The socket defaults to $BUDGET_SOCKET, then finance_tracker.sock.
+"""
+import json
+import os
+import socket
+import sys
+import threading
+
+SOCKET_PATH = "finance_tracker.sock"  # Same default as budget_tracker.SOCKET_PATH
+
+def connect(path=None):
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path or os.environ.get("BUDGET_SOCKET", SOCKET_PATH))
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+def request(message, path=None):
+    """Sends one request dict and returns the daemon's response dict."""
+    with connect(path) as sock:
+        sock.sendall(json.dumps(message).encode() + b"\n")
+        with sock.makefile("rb") as reader:
+            line = reader.readline()
+    if not line:
+        raise ConnectionError("The daemon closed the connection without replying; see its log")
+    return json.loads(line)
+
+def run_batch(path, lines, out):
+    """Streams --batch commands to the daemon and copies its result lines to out."""
+    sent = 0
+    with connect(path) as sock:
+        def pump():
+            nonlocal sent
+            try:
+                sock.sendall(b'{"batch": true}\n')
+                for line in lines:
+                    sock.sendall(line.encode())
+                    sent += bool(line.strip())
+                sock.shutdown(socket.SHUT_WR)
+            except OSError:
+                pass  # The daemon hung up; the reader below reports it
+
+        # Send from a thread so neither side blocks on a full socket buffer.
+        sender = threading.Thread(target=pump, daemon=True)
+        sender.start()
+        failures = received = 0
+        with sock.makefile("r", encoding="utf-8") as reader:
+            for line in reader:
+                failures += not json.loads(line)["ok"]
+                received += 1
+                out.write(line)
+        sender.join()
+    if received < sent:
+        print(f"❌ The daemon closed the connection after {received} of {sent} commands; "
+              "the batch was rolled back", file=sys.stderr)
+        return 1
+    return 1 if failures else 0
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    path = None
+    if argv[:1] == ["--socket"] and len(argv) > 1:
+        path, argv = argv[1], argv[2:]
+    try:
+        if argv == ["--batch"]:
+            return run_batch(path, sys.stdin, sys.stdout)
+        response = request({"argv": argv, "cwd": os.getcwd()}, path)
+    except (FileNotFoundError, ConnectionRefusedError):
+        print(f"❌ No daemon on {path or os.environ.get('BUDGET_SOCKET', SOCKET_PATH)}; "
+              "start one with: python3 budget_tracker.py daemon", file=sys.stderr)
+        return 2
+    except ConnectionError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    sys.stdout.write(response["stdout"])
+    sys.stderr.write(response["stderr"])
+    return response["exit"]
+
+if __name__ == "__main__":
+    sys.exit(main())
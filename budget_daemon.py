@@ -0,0 +1,177 @@
+"""Long-running budget_tracker server on a Unix domain socket.
+
+Start it with `python3 budget_tracker.py daemon` and talk to it with
+budget_client.py. The daemon pays Python startup, the matplotlib import,
+init_db and the cold SQLite page cache once; afterwards each command is a
+socket round trip on a warm pooled connection.
+
+Protocol: newline-delimited JSON over the socket, any number of requests per
+connection, one response line each.
+
+    {"argv": ["burn-rate", "--json"], "cwd": "/home/me"}
+        -> {"exit": 0, "stdout": "...", "stderr": ""}   (same output as the CLI)
+    {"cmd": "add", "amount": 12.5}
+        -> {"ok": true, "result": {...}}                (same as --batch)
+    {"batch": true}
+        -> the rest of the connection is a --batch session: one transaction,
+           results streamed back as the commands arrive
+    {"cmd": "ping"} / {"cmd": "shutdown"}
+"""
+import argparse
+import io
+import json
+import os
+import signal
+import socket
+import socketserver
+import sqlite3
+import sys
+import threading
+
+import budget_tracker as bt
+
+DAEMON_POOL_SIZE = 8  # Warm connections kept for client threads
+COMMAND_ERRORS = (ValueError, TypeError, KeyError, ArithmeticError, OSError, sqlite3.Error)
+# Flags that configure a process rather than a command; they belong on the daemon's own command line.
+PROCESS_OPTIONS = ("profile", "batch", "stats", "stats_json", "slow_query_ms", "slow_log", "metrics_port")
+
+_request = threading.local()
+
+class _ParserExit(Exception):
+    def __init__(self, status):
+        self.status = status
+
+class RequestParser(argparse.ArgumentParser):
+    """ArgumentParser that writes usage, help and errors back to the client instead of exiting."""
+
+    def _print_message(self, message, file=None):
+        if message:
+            (_request.err if file is sys.stderr else _request.out).write(message)
+
+    def exit(self, status=0, message=None):
+        if message:
+            _request.err.write(message)
+        raise _ParserExit(status)
+
+_parser = None
+
+def run_argv(argv, cwd=None):
+    """Runs a budget_tracker.py command line and captures what the CLI would print."""
+    global _parser
+    if _parser is None:
+        _parser = bt.build_parser(RequestParser)
+    out = _request.out = io.StringIO()
+    err = _request.err = io.StringIO()
+    try:
+        args = _parser.parse_args(argv)
+        if args.db and os.path.abspath(os.path.join(cwd or "", args.db)) != os.path.abspath(bt.DB_NAME):
+            raise ValueError(f"This daemon serves {bt.DB_NAME}")
+        used = [name for name in PROCESS_OPTIONS if getattr(args, name)]
+        if used or args.command in (None, "daemon", "api"):
+            raise ValueError(f"Not available through the daemon: {', '.join(used) or args.command or 'menu'}")
+        if getattr(args, "file", None):
+            if args.file == "-":
+                raise ValueError("stdin is not forwarded to the daemon; pass a file path")
+            args.file = os.path.join(cwd or "", args.file)
+        status = bt.run_cli(args, out)
+    except _ParserExit as e:
+        status = e.status
+    except COMMAND_ERRORS as e:
+        err.write(f"❌ {e}\n")
+        status = 1
+    return {"exit": status, "stdout": out.getvalue(), "stderr": err.getvalue()}
+
+def run_command(request, server):
+    """Runs one {"cmd": ...} request the way --batch does."""
+    name = request.get("cmd")
+    if name == "ping":
+        return {"ok": True, "result": "pong"}
+    if name == "shutdown":
+        threading.Thread(target=server.shutdown).start()
+        return {"ok": True, "result": "shutting down"}
+    try:
+        return {"ok": True, "result": bt.execute_command(request)}
+    except COMMAND_ERRORS as e:
+        return {"ok": False, "error": f"{type(e).__name__}: {e}"}
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        with bt.get_manager().pooled():
+            for line in self.rfile:
+                if not line.strip():
+                    continue
+                try:
+                    request = json.loads(line)
+                except ValueError as e:
+                    self.send({"ok": False, "error": f"Invalid JSON: {e}"})
+                    continue
+                if request.get("batch"):
+                    self.run_batch()
+                    return
+                if "argv" in request:
+                    self.send(run_argv(request["argv"], request.get("cwd")))
+                else:
+                    self.send(run_command(request, self.server))
+
+    def send(self, response):
+        self.wfile.write(json.dumps(response, default=str).encode() + b"\n")
+
+    def run_batch(self):
+        out = io.TextIOWrapper(self.wfile, encoding="utf-8", write_through=True)
+        try:
+            bt.run_batch((line.decode() for line in self.rfile), out)
+        finally:
+            out.detach()
+
+def _claim_socket(path):
+    """Removes a stale socket file, refusing to steal one a live daemon still answers on."""
+    if not os.path.exists(path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        os.unlink(path)
+    else:
+        raise ValueError(f"A daemon is already listening on {path}")
+    finally:
+        probe.close()
+
+def warm_up():
+    """Loads what the first requests would otherwise pay for."""
+    bt.get_renderer()  # The matplotlib import is the bulk of a cold chart
+    bt.calculate_burn_rates()
+    cycle = bt.get_current_cycle()
+    if cycle:
+        bt.get_category_totals(cycle[0])
+
+def serve(socket_path=None):
+    """Serves requests until SIGTERM/SIGINT or a shutdown request; returns the exit status."""
+    path = os.path.abspath(socket_path or bt.SOCKET_PATH)
+    _claim_socket(path)
+    # Outputs land next to the daemon, so hand clients absolute paths.
+    bt.REPORT_PATH = os.path.abspath(bt.REPORT_PATH)
+    bt.CHART_CACHE_DIR = os.path.abspath(bt.CHART_CACHE_DIR)
+    bt.ACTIVE_CYCLE_CACHE = True
+    bt.FORECAST_CACHE = True
+    bt.POOL_SIZE = max(bt.POOL_SIZE, DAEMON_POOL_SIZE)
+    bt.close_connections()  # Reopen the manager with the larger pool
+    bt.init_db()
+    warm_up()
+
+    server = socketserver.ThreadingUnixStreamServer(path, RequestHandler)
+    server.daemon_threads = True
+    stop = lambda signum, frame: threading.Thread(target=server.shutdown).start()
+    signal.signal(signal.SIGTERM, stop)
+    print(f"🟢 Serving {bt.DB_NAME} on {path}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(path):
+            os.unlink(path)
+        bt.close_renderer()
+    print("🔴 Daemon stopped.", file=sys.stderr)
+    return 0
@@ -0,0 +1,376 @@
+"""Streaming CSV bank-statement importer for budget_tracker.
+
+The main process streams records out of the CSV and is the only database
+writer. Worker processes turn raw records into validated transaction rows, and
+only a bounded number of chunks is ever in flight, so memory stays flat no
+matter how large the export is.
+"""
+import csv
+import hashlib
+import math
+import os
+import sqlite3
+import sys
+import time
+from array import array
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from decimal import Decimal
+from functools import lru_cache
+
+import budget_tracker as bt
+
+CHUNK_SIZE = 20000  # Records per worker task
+MAX_ERRORS = 100  # Error messages kept in the import summary
+BLOOM_BITS_PER_KEY = 10  # Duplicate pre-screen size; ~2% false positives
+LOOKUP_BATCH = 500  # Hashes per "content_hash IN (...)" confirmation query
+DEDUP_MEMORY_ROWS = 250_000  # Repeat counters held in memory (~25 MB) before the least recent days spill
+
+# Maps our fields to CSV header names (case-insensitive) or 0-based column indexes.
+# Use either a signed "amount" column or separate "debit"/"credit" columns.
+DEFAULT_MAPPING = {
+    "date": "Date",
+    "description": "Description",
+    "amount": "Amount",
+    "category": None,
+    "type": None,
+    "debit": None,
+    "credit": None,
+}
+
+# Values seen in bank "type" columns, lower-cased.
+TYPE_ALIASES = {
+    "expense": "expense", "debit": "expense", "dr": "expense", "withdrawal": "expense",
+    "income": "income", "credit": "income", "cr": "income", "deposit": "income",
+}
+
+@lru_cache(maxsize=8192)
+def _parse_date(text, date_format):
+    # Statements repeat the same few hundred dates, so parsing is cached per worker.
+    if date_format:
+        return datetime.strptime(text, date_format)
+    return datetime.fromisoformat(text)
+
+def _parse_amount(text):
+    """Parses '1,234.56', '$12.00', '-5', '(12.00)' into a signed Decimal."""
+    text = text.strip().replace(",", "").lstrip("$€£₹ ")
+    if text.startswith("(") and text.endswith(")"):
+        text = "-" + text[1:-1]
+    return Decimal(text) if text else None
+
+def _resolve_columns(mapping, header):
+    """Turns mapping values (header names or indexes) into column indexes."""
+    lookup = {name.strip().lower(): i for i, name in enumerate(header or [])}
+    columns = {}
+    for field, column in mapping.items():
+        if column is None or column == "":
+            columns[field] = None
+        elif isinstance(column, int) or str(column).isdigit():
+            columns[field] = int(column)
+        elif column.strip().lower() in lookup:
+            columns[field] = lookup[column.strip().lower()]
+        else:
+            raise ValueError(f"Column {column!r} for {field!r} not found in header {header}")
+    if columns["date"] is None:
+        raise ValueError("A 'date' column mapping is required")
+    if columns["amount"] is None and columns["debit"] is None and columns["credit"] is None:
+        raise ValueError("Map either an 'amount' column or 'debit'/'credit' columns")
+    return columns
+
+def _parse_record(record, columns, options):
+    """Turns one CSV record into a (type, amount, category, description, timestamp) row."""
+    def field(name):
+        index = columns[name]
+        return record[index].strip() if index is not None and index < len(record) else ""
+
+    if columns["amount"] is not None:
+        amount = _parse_amount(field("amount"))
+        if amount is None:
+            raise ValueError("empty amount")
+        negative_is_expense = options["expense_sign"] == "negative"
+        t_type = "expense" if (amount < 0) == negative_is_expense else "income"
+    else:
+        debit, credit = _parse_amount(field("debit")), _parse_amount(field("credit"))
+        t_type, amount = ("expense", debit) if debit else ("income", credit)
+        if amount is None:
+            raise ValueError("both debit and credit are empty")
+    if columns["type"] is not None:
+        raw_type = field("type").lower()
+        if raw_type not in TYPE_ALIASES:
+            raise ValueError(f"unknown transaction type {raw_type!r}")
+        t_type = TYPE_ALIASES[raw_type]
+    category = field("category").title() or options["default_category"]
+    timestamp = _parse_date(field("date"), options["date_format"])
+    return (t_type, abs(amount), category, field("description"), timestamp)
+
+def _hash64(text):
+    # Signed so it fits an SQLite INTEGER.
+    return int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), "big", signed=True)
+
+def content_hash(row):
+    """Identity of a prepared row: cycle, type, amount, day and normalized description.
+
+    Category and time of day are left out, so re-mapping categories or a bank
+    exporting times differently still matches the earlier import.
+    """
+    cycle_id, t_type, _, cents, desc, _, ts_epoch = row[:7]
+    desc = " ".join((desc or "").casefold().split())
+    return _hash64(f"{cycle_id}|{t_type}|{cents}|{ts_epoch // 86400}|{desc}")
+
+def occurrence_hash(base, occurrence):
+    """Hash of the n-th identical line in one file, so genuine repeats survive."""
+    return base if occurrence == 1 else _hash64(f"{base}#{occurrence}")
+
+class BloomFilter:
+    """Blocked Bloom filter over 64-bit integer hashes.
+
+    `h in bloom` is never False for an added hash and wrongly True for about
+    2% of the others. Each hash sets five bits inside a single 64-bit block,
+    taken straight from the (already uniform) hash, so a lookup is one array
+    read and a mask compare.
+    """
+
+    def __init__(self, capacity):
+        self.size = max(1, math.ceil(max(capacity, 1024) * BLOOM_BITS_PER_KEY / 64))
+        self.blocks = array("Q", bytes(8 * self.size))
+
+    def _locate(self, h):
+        mask = (1 << (h & 63) | 1 << (h >> 6 & 63) | 1 << (h >> 12 & 63)
+                | 1 << (h >> 18 & 63) | 1 << (h >> 24 & 63))
+        return (h >> 30 & 0x3FFFFFFFF) % self.size, mask
+
+    def add(self, h):
+        block, mask = self._locate(h)
+        self.blocks[block] |= mask
+
+    def __contains__(self, h):
+        block, mask = self._locate(h)
+        return self.blocks[block] & mask == mask
+
+def stored_hash_filter(conn):
+    """Bloom filter over every content_hash already in the database."""
+    count = conn.execute("SELECT COUNT(*) FROM transactions WHERE content_hash IS NOT NULL").fetchone()[0]
+    bloom = BloomFilter(count)
+    for (h,) in conn.execute("SELECT content_hash FROM transactions WHERE content_hash IS NOT NULL"):
+        bloom.add(h)
+    return bloom
+
+def _stored_hashes(conn, hashes):
+    found = set()
+    for i in range(0, len(hashes), LOOKUP_BATCH):
+        chunk = hashes[i:i + LOOKUP_BATCH]
+        found.update(h for (h,) in conn.execute(
+            f"SELECT content_hash FROM transactions WHERE content_hash IN ({','.join('?' * len(chunk))})", chunk))
+    return found
+
+class Deduplicator:
+    """Drops rows whose content hash is already stored.
+
+    Rows arrive with their base content_hash() appended. Repeats within the
+    import are numbered (occurrence_hash) rather than dropped, and the Bloom
+    filter means only rows that might already be stored are confirmed against
+    the unique index, so a mostly-new file costs no lookups at all.
+
+    The base hash includes the day, so repeats are counted per day. Statements
+    come roughly in date order, so only the counters of the most recently used
+    days stay in memory; past DEDUP_MEMORY_ROWS the least recent days spill to
+    a private temporary database and are looked up there if the file returns
+    to them.
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.bloom = stored_hash_filter(conn)
+        self._days = OrderedDict()  # day -> {base hash: occurrences so far}, least recently used first
+        self._held = 0  # Counters in _days
+        self._spilled = set()  # Days with counters in _spill
+        self._spill = None
+
+    def filter(self, rows):
+        """Returns the new rows, ready for budget_tracker.INSERT_IMPORTED_SQL."""
+        bloom = self.bloom
+        keyed, maybe = [], []
+        day = counts = None
+        held = 0
+        for row in rows:
+            base = row[7]
+            if row[6] // 86400 != day:
+                day = row[6] // 86400
+                counts = self._counts(day)
+                spilled = day in self._spilled
+            occurrence = counts.get(base, 0)
+            if not occurrence:
+                held += 1
+                if spilled:
+                    occurrence = self._spilled_count(day, base)
+            occurrence += 1
+            counts[base] = occurrence
+            if occurrence > 1:
+                row = row[:7] + (occurrence_hash(base, occurrence),)
+            keyed.append(row)
+            if row[7] in bloom:
+                maybe.append(row[7])
+        self._held += held
+        while self._held > DEDUP_MEMORY_ROWS:
+            self._spill_day(*self._days.popitem(last=False))
+        if not maybe:
+            return keyed
+        stored = _stored_hashes(self.conn, maybe)
+        return [row for row in keyed if row[7] not in stored] if stored else keyed
+
+    def _counts(self, day):
+        counts = self._days.get(day)
+        if counts is None:
+            counts = self._days[day] = {}
+        else:
+            self._days.move_to_end(day)
+        return counts
+
+    def _spilled_count(self, day, base):
+        row = self._spill.execute("SELECT n FROM seen WHERE day = ? AND hash = ?", (day, base)).fetchone()
+        return row[0] if row else 0
+
+    def _spill_day(self, day, counts):
+        if self._spill is None:
+            # "" is a temporary on-disk database that SQLite deletes on close.
+            self._spill = sqlite3.connect("")
+            self._spill.execute("PRAGMA cache_size = -4096")
+            self._spill.execute("PRAGMA journal_mode = OFF")
+            self._spill.execute("""CREATE TABLE seen (day INTEGER, hash INTEGER, n INTEGER,
+                                   PRIMARY KEY (day, hash)) WITHOUT ROWID""")
+        # Counts loaded back from disk were carried on in memory, so these replace them.
+        # In key order, the inserts append to the b-tree instead of splitting pages all over it.
+        self._spill.executemany("INSERT OR REPLACE INTO seen VALUES (?, ?, ?)",
+                                ((day, base, n) for base, n in sorted(counts.items())))
+        self._spill.commit()
+        self._spilled.add(day)
+        self._held -= len(counts)
+
+    def close(self):
+        if self._spill is not None:
+            self._spill.close()
+            self._spill = None
+
+def parse_chunk(cycle_id, columns, options, first_record, records):
+    """Worker task: returns (prepared_rows, errors) for a list of raw CSV records.
+
+    Rows are prepare_transaction_row() tuples with their content_hash()
+    appended; errors are (record_number, message) pairs for records that
+    failed validation.
+    """
+    rows, errors = [], []
+    for number, record in enumerate(records, start=first_record):
+        if not record:
+            continue
+        try:
+            row = bt.prepare_transaction_row(cycle_id, _parse_record(record, columns, options))
+            rows.append(row + (content_hash(row),))
+        except (ValueError, TypeError, ArithmeticError, IndexError) as e:
+            if len(errors) < MAX_ERRORS:
+                errors.append((number, str(e)))
+    return rows, errors
+
+def _chunks(reader, size):
+    number, chunk = 1, []
+    for record in reader:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield number, chunk
+            number, chunk = number + len(chunk), []
+    if chunk:
+        yield number, chunk
+
+def _parsed_chunks(reader, chunk_size, workers, task_args):
+    """Yields (rows, errors, record_count) per chunk, in file order."""
+    if workers <= 0:
+        for first, records in _chunks(reader, chunk_size):
+            yield (*parse_chunk(*task_args, first, records), len(records))
+        return
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        try:
+            for first, records in _chunks(reader, chunk_size):
+                pending.append((pool.submit(parse_chunk, *task_args, first, records), len(records)))
+                # Bound the work in flight so memory does not grow with the file.
+                if len(pending) >= workers * 2:
+                    future, count = pending.popleft()
+                    yield (*future.result(), count)
+            while pending:
+                future, count = pending.popleft()
+                yield (*future.result(), count)
+        finally:
+            for future, _ in pending:
+                future.cancel()
+
+def default_workers():
+    # The main process is busy writing, so leave it a core of its own.
+    return max((os.cpu_count() or 1) - 1, 0)
+
+def import_csv(path, cycle_id=None, mapping=None, date_format=None, expense_sign="negative",
+               default_category="Misc", delimiter=",", has_header=True, workers=None,
+               chunk_size=None, commit_rows=500_000, strict=False, progress=None):
+    """Streams a CSV bank statement into the transactions table.
+
+    Records are parsed in a pool of `workers` processes (one per spare core by
+    default, 0 to parse inline) while this process writes the results in file
+    order, committing every `commit_rows` rows (inside an outer
+    budget_tracker.transaction() everything joins that one instead). Lines
+    already imported earlier are skipped as duplicates (see Deduplicator).
+    Invalid records are skipped and reported, or abort the import if `strict` is set.
+    `progress(stats)` is called after every chunk. Returns the final stats dict.
+    """
+    if expense_sign not in ("negative", "positive"):
+        raise ValueError("expense_sign must be 'negative' or 'positive'")
+    mapping = {**DEFAULT_MAPPING, **(mapping or {})}
+    options = {"date_format": date_format, "expense_sign": expense_sign, "default_category": default_category}
+    if cycle_id is None:
+        cycle = bt.get_current_cycle()
+        if cycle is None:
+            raise ValueError("No budget cycle yet; start one before importing")
+        cycle_id = cycle[0]
+    workers = default_workers() if workers is None else workers
+
+    stats = {"read": 0, "inserted": 0, "duplicates": 0, "skipped": 0, "errors": [],
+             "seconds": 0.0, "rows_per_sec": 0.0}
+    started = time.perf_counter()
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f, delimiter=delimiter)
+        header = next(reader, None) if has_header else None
+        columns = _resolve_columns(mapping, header)
+        dedup = Deduplicator(bt.get_connection())
+        chunks = _parsed_chunks(reader, chunk_size or CHUNK_SIZE, workers, (cycle_id, columns, options))
+        try:
+            done = False
+            while not done:
+                done = True
+                with bt.transaction() as conn, bt.BulkWriter(conn, bt.INSERT_IMPORTED_SQL) as writer:
+                    for rows, errors, count in chunks:
+                        if errors and strict:
+                            raise ValueError(f"Record {errors[0][0]}: {errors[0][1]}")
+                        new_rows = dedup.filter(rows)
+                        writer.write(new_rows)
+                        stats["read"] += count
+                        stats["inserted"] += len(new_rows)
+                        stats["duplicates"] += len(rows) - len(new_rows)
+                        stats["skipped"] += count - len(rows)
+                        stats["errors"].extend(errors[:MAX_ERRORS - len(stats["errors"])])
+                        elapsed = time.perf_counter() - started
+                        stats["seconds"], stats["rows_per_sec"] = elapsed, stats["read"] / elapsed
+                        if progress:
+                            progress(stats)
+                        if writer.inserted >= commit_rows:
+                            done = False
+                            break
+                bt.TRANSACTIONS_INSERTED.inc(writer.inserted)
+        finally:
+            chunks.close()
+            dedup.close()
+    return stats
+
+def print_progress(stats):
+    """Progress callback for the CLI: one updating line on stderr."""
+    sys.stderr.write(f"\r  {stats['read']:>12,} records  {stats['inserted']:>12,} inserted"
+                     f"  {stats['duplicates']:>12,} duplicates"
+                     f"  {stats['rows_per_sec']:>10,.0f} rows/s")
+    sys.stderr.flush()
@@ -0,0 +1,142 @@
+"""Always-on operational metrics in the Prometheus text exposition format.
+
+budget_tracker updates the counters and histograms below from its core
+functions; gauges such as the database and WAL size are read when scraped.
+serve() exposes them on a local HTTP endpoint for a Prometheus scraper:
+
+    python3 budget_tracker.py --metrics-port 9464 ...
+    curl -s localhost:9464/metrics
+
+Only the standard library is used, and every update is a lock plus a few
+additions, so the metrics stay on even in the bulk paths.
+"""
+import threading
+from bisect import bisect_left
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class Counter:
+    """Monotonically increasing value, e.g. rows inserted."""
+
+    kind = "counter"
+
+    def __init__(self, name, help):
+        self.name, self.help = name, help
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+    def samples(self):
+        return [(self.name, "", self.value)]
+
+class Histogram:
+    """Distribution of observed values (seconds) over fixed cumulative buckets."""
+
+    kind = "histogram"
+
+    def __init__(self, name, help, buckets=DEFAULT_BUCKETS):
+        self.name, self.help = name, help
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    def samples(self):
+        with self._lock:
+            counts, total = list(self.counts), self.sum
+        result, running = [], 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            running += count
+            result.append((self.name + "_bucket", f'{{le="{_format(bound)}"}}', running))
+        result.append((self.name + "_sum", "", total))
+        result.append((self.name + "_count", "", running))
+        return result
+
+class GaugeFunc:
+    """Value computed by a callback at scrape time, e.g. a file size."""
+
+    kind = "gauge"
+
+    def __init__(self, name, help, read):
+        self.name, self.help = name, help
+        self.read = read
+
+    def samples(self):
+        return [(self.name, "", self.read())]
+
+def _format(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name!r} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, help):
+        return self.register(Counter(name, help))
+
+    def histogram(self, name, help, buckets=DEFAULT_BUCKETS):
+        return self.register(Histogram(name, help, buckets))
+
+    def gauge(self, name, help, read):
+        return self.register(GaugeFunc(name, help, read))
+
+    def render(self):
+        """The whole registry in Prometheus text format (version 0.0.4)."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{labels} {_format(value)}")
+        return "\n".join(lines) + "\n"
+
+REGISTRY = Registry()
+
+def serve(port=9464, host="127.0.0.1", registry=REGISTRY):
+    """Serves GET /metrics from a daemon thread; returns the server (call shutdown() to stop).
+
+    Binds to localhost by default; port 0 picks a free port (see server.server_port).
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/metrics", "/"):
+                self.send_error(404)
+                return
+            body = registry.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # Scrapes every few seconds would drown stderr
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
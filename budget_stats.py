@@ -0,0 +1,256 @@
+"""Opt-in latency instrumentation for budget_tracker.
+
+When enabled, every @instrument-ed core function, every SQL statement (on
+connections opened afterwards) and the chart draw/savefig phases record a
+call count, total time, rows returned and a sample of latencies for
+p50/p95/p99. Statements slower than the slow-query threshold are logged.
+
+Disabled (the default), an instrumented call costs one flag check and
+connections are plain sqlite3.Connection objects.
+"""
+import functools
+import json
+import random
+import sqlite3
+import threading
+import time
+from contextlib import nullcontext
+
+ENABLED = False
+SLOW_QUERY_MS = None  # Log statements whose execute takes longer than this; None disables the log
+RESERVOIR_SIZE = 2048  # Latency samples kept per name for the percentiles
+
+SLOW_LOG_NAME = "budget_tracker.slow_query"  # logging logger that receives slow statements
+_CO_GENERATOR = 0x20  # inspect.CO_GENERATOR, without importing inspect at startup
+
+class Stat:
+    """Aggregates for one function or statement, with a uniform reservoir of latencies."""
+
+    __slots__ = ("count", "total", "rows", "samples")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.rows = 0
+        self.samples = []
+
+    def add(self, seconds, rows):
+        self.count += 1
+        self.total += seconds
+        self.rows += rows
+        if len(self.samples) < RESERVOIR_SIZE:
+            self.samples.append(seconds)
+        else:
+            slot = random.randrange(self.count)
+            if slot < RESERVOIR_SIZE:
+                self.samples[slot] = seconds
+
+    def summary(self):
+        ordered = sorted(self.samples)
+        pick = lambda q: ordered[min(int(q * len(ordered)), len(ordered) - 1)] * 1000 if ordered else 0.0
+        return {"count": self.count, "total_ms": self.total * 1000, "rows": self.rows,
+                "p50_ms": pick(0.50), "p95_ms": pick(0.95), "p99_ms": pick(0.99)}
+
+_stats = {}
+_lock = threading.Lock()
+
+def record(name, seconds, rows=0):
+    with _lock:
+        stat = _stats.get(name)
+        if stat is None:
+            stat = _stats[name] = Stat()
+        stat.add(seconds, rows)
+
+def _add_rows(name, seconds, rows):
+    # Fetch time and rows belong to the statement but are not a call of their own.
+    with _lock:
+        stat = _stats.get(name)
+        if stat is not None:
+            stat.total += seconds
+            stat.rows += rows
+
+def enable(slow_query_ms=None):
+    """Starts recording. SQL is timed on connections opened from now on, so
+    call budget_tracker.close_connections() first if some are already open."""
+    global ENABLED, SLOW_QUERY_MS
+    ENABLED = True
+    SLOW_QUERY_MS = slow_query_ms
+
+def disable():
+    global ENABLED
+    ENABLED = False
+
+def reset():
+    with _lock:
+        _stats.clear()
+
+def snapshot():
+    """Returns {name: {count, total_ms, rows, p50_ms, p95_ms, p99_ms}}, slowest total first."""
+    with _lock:
+        items = [(name, stat.summary()) for name, stat in _stats.items()]
+    return dict(sorted(items, key=lambda item: -item[1]["total_ms"]))
+
+def dump_json(path):
+    with open(path, "w") as f:
+        json.dump(snapshot(), f, indent=2)
+
+def format_table(stats, width=60):
+    lines = [f"{'name':<{width}}{'count':>9}{'total ms':>12}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'rows':>10}"]
+    for name, s in stats.items():
+        label = name if len(name) <= width - 1 else name[:width - 4] + "..."
+        lines.append(f"{label:<{width}}{s['count']:>9,}{s['total_ms']:>12.2f}{s['p50_ms']:>10.3f}"
+                     f"{s['p95_ms']:>10.3f}{s['p99_ms']:>10.3f}{s['rows']:>10,}")
+    return "\n".join(lines)
+
+# --- Wrappers ---
+
+class _Timer:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        record(self.name, time.perf_counter() - self.start)
+
+_NOOP = nullcontext()
+
+def timed(name):
+    """Context manager that records the block under `name` while enabled."""
+    return _Timer(name) if ENABLED else _NOOP
+
+def _timed_iter(name, iterator):
+    # Only time spent inside the generator counts, not the consumer's work between items.
+    elapsed, rows = 0.0, 0
+    try:
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                elapsed += time.perf_counter() - start
+            rows += 1
+            yield item
+    finally:
+        record(name, elapsed, rows)
+
+def instrument(fn):
+    """Records calls of fn under its name while instrumentation is enabled."""
+    name = fn.__qualname__
+    if fn.__code__.co_flags & _CO_GENERATOR:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return fn(*args, **kwargs)
+            return _timed_iter(name, fn(*args, **kwargs))
+    else:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record(name, time.perf_counter() - start)
+    return wrapper
+
+# --- SQL ---
+
+def _log_slow(elapsed, message, *args):
+    import logging  # Only needed once something is slow
+    logging.getLogger(SLOW_LOG_NAME).warning("%.1f ms: " + message, elapsed * 1000, *args)
+
+def _statement_name(sql):
+    return "sql: " + " ".join(sql.split())
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Attributes fetch time and fetched rows to the statement that produced them."""
+
+    _name = None
+
+    def _fetched(self, start, rows):
+        elapsed = time.perf_counter() - start
+        record("sql:fetch", elapsed, rows)
+        if self._name:
+            _add_rows(self._name, elapsed, rows)
+
+    def execute(self, sql, parameters=()):
+        self._name = _statement_name(sql)
+        start = time.perf_counter()
+        super().execute(sql, parameters)
+        elapsed = time.perf_counter() - start
+        record(self._name, elapsed)
+        if SLOW_QUERY_MS is not None and elapsed * 1000 >= SLOW_QUERY_MS:
+            _log_slow(elapsed, "%s %r", self._name[5:], parameters)
+        return self
+
+    def executemany(self, sql, seq_of_parameters):
+        self._name = None
+        name = _statement_name(sql)
+        start = time.perf_counter()
+        super().executemany(sql, seq_of_parameters)
+        elapsed = time.perf_counter() - start
+        record(name, elapsed, max(self.rowcount, 0))
+        if SLOW_QUERY_MS is not None and elapsed * 1000 >= SLOW_QUERY_MS:
+            _log_slow(elapsed, "%s (executemany, %d rows)", name[5:], self.rowcount)
+        return self
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = super().fetchone()
+        self._fetched(start, 0 if row is None else 1)
+        return row
+
+    def fetchmany(self, size=None):
+        start = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self._fetched(start, len(rows))
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = super().fetchall()
+        self._fetched(start, len(rows))
+        return rows
+
+    def __next__(self):
+        start = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._fetched(start, 0)
+            raise
+        self._fetched(start, 1)
+        return row
+
+class InstrumentedConnection(sqlite3.Connection):
+    """sqlite3 connection that times statements, commits and rollbacks."""
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def commit(self):
+        start = time.perf_counter()
+        super().commit()
+        record("sql:commit", time.perf_counter() - start)
+
+    def rollback(self):
+        start = time.perf_counter()
+        super().rollback()
+        record("sql:rollback", time.perf_counter() - start)
+
+def connection_factory():
+    """The sqlite3.connect factory to use for a new connection."""
+    return InstrumentedConnection if ENABLED else sqlite3.Connection
@@ -1,21 +1,549 @@
 import sqlite3
 import os
+import argparse
+import atexit
+import csv
+import hashlib
+import json
+import math
+import queue
+import shutil
+import sys
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from contextlib import contextmanager
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from itertools import count, islice
 from datetime import date, timedelta, datetime
-import matplotlib.pyplot as plt
+
+import budget_metrics
+import budget_stats
+from budget_stats import instrument, timed
 
 DB_NAME = "finance_tracker.db"
+POOL_SIZE = 0  # Extra pooled connections kept for short-lived worker threads
+PRAGMA_PROFILE = "fast"  # Key of PRAGMA_PROFILES applied by init_db and every new connection
+BULK_BATCH_SIZE = 5000  # Rows per executemany call in add_transactions
+BULK_DEFER_TOTALS_ROWS = 5000  # Loads at least this big fold cycle_totals in once instead of per row
+TRANSACTION_TYPES = ('income', 'expense')
+REPORT_PATH = "spending_report_cycle_{cycle_id}.png"
+CHART_CACHE_DIR = ".chart_cache"
+CHART_CACHE_MAX_BYTES = 64 * 2**20
+CHART_CACHE_MAX_ENTRIES = 500
+SOCKET_PATH = "finance_tracker.sock"  # Default Unix socket of the daemon (budget_daemon.py)
+WRITE_BEHIND_ROWS = 1000  # Buffered rows that trigger a write-behind commit
+WRITE_BEHIND_MS = 20  # Longest a buffered row waits for its write-behind commit
+ACTIVE_CYCLE_CACHE = False  # Serve the newest cycle from memory (ActiveCycle); on in long-running sessions
+QUERY_CACHE_BYTES = 4 * 2**20  # Byte budget of the read-query result cache; 0 turns it off
+FORECAST_CACHE = False  # Memoize burn-rate forecasts per day and cycle write (Forecaster); on in long-running sessions
+FORECAST_REFRESH_SECONDS = 1.0  # How often the Forecaster looks for a new day or commits by other processes
 
-def init_db():
-    """Initializes the database with a 3NF Normalized Schema."""
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    
+# --- Metrics ---
+# Always-on counters and histograms for budget_metrics.serve() (see --metrics-port).
+
+def _file_size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+METRICS = budget_metrics.REGISTRY
+TRANSACTIONS_INSERTED = METRICS.counter("budget_transactions_inserted_total",
+                                        "Transactions written, including bulk loads and imports")
+COMMIT_SECONDS = METRICS.histogram("budget_commit_duration_seconds", "Latency of database commits")
+BURN_RATE_SECONDS = METRICS.histogram("budget_burn_rate_duration_seconds",
+                                      "Time to compute one cycle's burn-rate forecast")
+CHART_RENDER_SECONDS = METRICS.histogram("budget_chart_render_duration_seconds",
+                                         "Time to draw and save a spending chart (cache misses only)")
+CHART_CACHE_HITS = METRICS.counter("budget_chart_cache_hits_total", "Chart requests served from the cache")
+QUERY_CACHE_HITS = METRICS.counter("budget_query_cache_hits_total", "Read queries answered from the result cache")
+QUERY_CACHE_MISSES = METRICS.counter("budget_query_cache_misses_total", "Read queries that went to SQLite")
+FORECAST_CACHE_HITS = METRICS.counter("budget_forecast_cache_hits_total", "Burn-rate forecasts served from the memo")
+METRICS.gauge("budget_query_cache_bytes", "Estimated size of the query result cache",
+              lambda: _query_cache.bytes if _query_cache else 0)
+METRICS.gauge("budget_db_size_bytes", "Size of the database file", lambda: _file_size(DB_NAME))
+METRICS.gauge("budget_wal_size_bytes", "Size of the write-ahead log", lambda: _file_size(DB_NAME + "-wal"))
+
+# Hot read queries, kept in one place so check_query_plans() audits exactly what runs.
+_BURN_RATE_SQL = """
+    SELECT cycles.id, cycles.start_day,
+           COALESCE(SUM(CASE WHEN cycle_totals.type = 'income' THEN cycle_totals.total END), 0),
+           COALESCE(SUM(CASE WHEN cycle_totals.type = 'expense' THEN cycle_totals.total END), 0)
+    FROM cycles LEFT JOIN cycle_totals ON cycle_totals.cycle_id = cycles.id
+    {where} GROUP BY cycles.id"""
+HOT_QUERIES = {
+    "burn_rate": (_BURN_RATE_SQL.format(where="WHERE cycles.id = ?"), (1,)),
+    "burn_rate_all": (_BURN_RATE_SQL.format(where=""), ()),
+    "category_breakdown": ("SELECT category, total FROM cycle_totals "
+                           "WHERE cycle_id = ? AND type = 'expense' ORDER BY category", (1,)),
+}
+_SPEND_BETWEEN_SQL = ("SELECT {select} FROM transactions "
+                      "WHERE type = 'expense' AND ts_epoch >= ? AND ts_epoch < ?{where}")
+HOT_QUERIES.update({
+    "spend_between": (_SPEND_BETWEEN_SQL.format(select="SUM(amount)", where=""), (0, 1)),
+    "category_spend_between": (_SPEND_BETWEEN_SQL.format(select="category, SUM(amount)", where="")
+                               + " GROUP BY category", (0, 1)),
+    "content_hash_lookup": ("SELECT content_hash FROM transactions WHERE content_hash IN (?, ?)", (1, 2)),
+})
+HOT_TABLES = ('transactions', 'cycle_totals')
+
+INSERT_TRANSACTION_SQL = """
+    INSERT INTO transactions (cycle_id, type, category, amount, description, timestamp, ts_epoch) 
+    VALUES (?, ?, ?, ?, ?, ?, ?)"""
+# Imported rows also carry a content hash; the unique index rejects duplicates.
+INSERT_IMPORTED_SQL = """
+    INSERT INTO transactions (cycle_id, type, category, amount, description, timestamp, ts_epoch, content_hash)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)"""
+
+# Full recompute of cycle_totals; rows without a cycle or type are not tracked.
+_RECOMPUTE_TOTALS_SQL = """
+    SELECT cycle_id, type, IFNULL(category, 'Misc'), SUM(amount), COUNT(*)
+    FROM transactions WHERE cycle_id IS NOT NULL AND type IS NOT NULL
+    GROUP BY cycle_id, type, IFNULL(category, 'Misc')"""
+
+# --- Money ---
+# Amounts are stored as INTEGER cents so sums stay exact; convert only at the edges.
+
+def to_cents(amount):
+    """Converts a currency amount (int, float, Decimal or numeric string) to integer cents."""
+    if isinstance(amount, bool):
+        raise TypeError(f"amount must be a number, got {amount!r}")
+    if isinstance(amount, int):
+        return amount * 100
+    if isinstance(amount, float):
+        if not math.isfinite(amount):
+            raise ValueError(f"amount must be finite, got {amount!r}")
+        cents = amount * 100
+        nearest = round(cents)
+        if abs(cents - nearest) < 1e-6 and abs(cents) < 2**50:
+            return nearest  # Whole cents (the usual case) can't be a rounding tie
+        # Round what was typed, not the binary float: repr is the shortest decimal that round-trips.
+        amount = repr(amount)
+    try:
+        return int((Decimal(amount) * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+    except (InvalidOperation, TypeError):
+        raise ValueError(f"amount must be a number, got {amount!r}") from None
+
+def from_cents(cents):
+    """Converts integer cents back to a float amount for display."""
+    return cents / 100
+
+# --- Dates ---
+# Timestamps are naive local wall-clock times. Alongside the ISO text we store
+# seconds (ts_epoch) and days (start_day/end_day) since 1970-01-01 of that wall
+# clock, which match SQLite's strftime('%s') and compare as plain integers.
+
+_EPOCH = datetime(1970, 1, 1)
+_SECOND = timedelta(seconds=1)
+_EPOCH_ORDINAL = _EPOCH.toordinal()
+
+def _as_datetime(value):
+    """Parses a datetime, date or ISO string into a naive local datetime."""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    elif not isinstance(value, datetime):
+        value = datetime.combine(value, datetime.min.time())
+    if value.tzinfo is not None:
+        value = value.astimezone().replace(tzinfo=None)
+    return value
+
+def to_epoch(value):
+    """Seconds since 1970-01-01 for a datetime, date or ISO string."""
+    return (_as_datetime(value) - _EPOCH) // _SECOND
+
+def to_day(value):
+    """Day number since 1970-01-01 for a date, datetime or ISO string."""
+    return _as_datetime(value).toordinal() - _EPOCH_ORDINAL
+
+def _epoch_range(start, end):
+    """Half-open [start, end) epoch bounds; a plain date as end includes that whole day."""
+    end_epoch = to_epoch(end)
+    if not isinstance(end, datetime) and not (isinstance(end, str) and len(end) > 10):
+        end_epoch += 86400
+    return to_epoch(start), end_epoch
+
+# --- Connection Management ---
+
+# Every profile uses WAL so report readers never block writers (and vice versa).
+# "durable" fsyncs each commit, "fast" (the default) only at checkpoints, which
+# is still crash-safe but may lose the last commits on power loss, and
+# "bulk-load" skips fsync entirely for one-off imports.
+PRAGMA_PROFILES = {
+    "durable": {"journal_mode": "WAL", "synchronous": "FULL", "cache_size": -16384,
+                "mmap_size": 0, "temp_store": "DEFAULT", "busy_timeout": 5000},
+    "fast": {"journal_mode": "WAL", "synchronous": "NORMAL", "cache_size": -65536,
+             "mmap_size": 256 * 2**20, "temp_store": "MEMORY", "busy_timeout": 5000},
+    "bulk-load": {"journal_mode": "WAL", "synchronous": "OFF", "cache_size": -262144,
+                  "mmap_size": 2**30, "temp_store": "MEMORY", "busy_timeout": 30000},
+}
+
+def _check_profile(profile):
+    if profile not in PRAGMA_PROFILES:
+        raise ValueError(f"Unknown pragma profile {profile!r}; choose from {', '.join(PRAGMA_PROFILES)}")
+
+def apply_pragma_profile(conn, profile, include_journal_mode=True):
+    """Applies a PRAGMA_PROFILES entry (by name) to conn.
+
+    journal_mode is persistent in the database file, so new connections skip it.
+    """
+    _check_profile(profile)
+    for pragma, value in PRAGMA_PROFILES[profile].items():
+        if pragma != "journal_mode" or include_journal_mode:
+            conn.execute(f"PRAGMA {pragma} = {value}")
+
+class ConnectionManager:
+    """Owns one long-lived SQLite connection per thread, plus an optional pool.
+
+    Keeping connections open avoids the connect/close cost on every call and
+    keeps sqlite3's per-connection statement cache warm, so hot queries are
+    prepared once instead of on every call.
+    """
+
+    PRAGMAS = ("PRAGMA foreign_keys = ON",)
+
+    def __init__(self, path, pool_size=0, profile=None):
+        self.path = path
+        self.pool_size = pool_size
+        self.profile = profile
+        self._local = threading.local()
+        self._pool = queue.LifoQueue(maxsize=pool_size) if pool_size else None
+        self._read_pool = queue.LifoQueue(maxsize=pool_size) if pool_size else None
+        self._lock = threading.Lock()
+        self._opened = []
+        self._seq = count(1)
+        self.write_seq = 0  # Bumped by every commit through transaction(), on any thread
+
+    def _connect(self, readonly=False, profile=True):
+        target, uri = self.path, False
+        if readonly:
+            from urllib.parse import quote
+            target, uri = f"file:{quote(os.path.abspath(self.path))}?mode=ro", True
+        with timed("sql:connect"):
+            conn = sqlite3.connect(target, uri=uri, check_same_thread=False,
+                                   factory=budget_stats.connection_factory())
+        for pragma in self.PRAGMAS:
+            conn.execute(pragma)
+        if profile and self.profile:
+            apply_pragma_profile(conn, self.profile, include_journal_mode=False)
+        with self._lock:
+            self._opened.append(conn)
+        return conn
+
+    def set_profile(self, profile):
+        """Switches the pragma profile for new connections and every idle open one."""
+        _check_profile(profile)
+        current = getattr(self._local, "conn", None)
+        if current is None:
+            # The old profile would be overwritten straight away, so don't apply it
+            current = self._local.conn = self._connect(profile=False)
+        apply_pragma_profile(current, profile)
+        self.profile = profile
+        with self._lock:
+            opened = list(self._opened)
+        for conn in opened:
+            if conn is not current and not conn.in_transaction:
+                apply_pragma_profile(conn, profile, include_journal_mode=False)
+
+    def get(self):
+        """Returns the calling thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    @contextmanager
+    def pooled(self, readonly=False):
+        """Binds a pooled connection to the calling thread for the block.
+
+        With readonly=True the connection is opened with mode=ro: in WAL mode it
+        reads concurrently with the writer, and any write raises. Threads that
+        already hold a connection simply reuse it.
+        """
+        if getattr(self._local, "conn", None) is not None:
+            yield self._local.conn
+            return
+        pool = self._read_pool if readonly else self._pool
+        try:
+            conn = pool.get_nowait() if pool else self._connect(readonly)
+        except queue.Empty:
+            conn = self._connect(readonly)
+        self._local.conn = conn
+        try:
+            yield conn
+        finally:
+            self._local.conn = None
+            if pool is None:
+                self._discard(conn)
+            else:
+                try:
+                    pool.put_nowait(conn)
+                except queue.Full:
+                    self._discard(conn)
+
+    @contextmanager
+    def transaction(self):
+        """Runs the block as one transaction; nested blocks join the outer one."""
+        conn = self.get()
+        depth = getattr(self._local, "depth", 0)
+        self._local.depth = depth + 1
+        try:
+            yield conn
+        except BaseException:
+            if depth == 0:
+                self._local.touched = None
+                conn.rollback()
+            raise
+        else:
+            if depth == 0:
+                start = time.perf_counter()
+                conn.commit()
+                COMMIT_SECONDS.observe(time.perf_counter() - start)
+                self.write_seq = next(self._seq)
+                touched, self._local.touched = getattr(self._local, "touched", None), None
+                forecaster = _forecaster
+                if forecaster is not None:
+                    forecaster.written(touched)
+        finally:
+            self._local.depth = depth
+
+    def in_transaction(self):
+        """True while the calling thread is inside transaction()."""
+        return getattr(self._local, "depth", 0) > 0
+
+    def touch(self, cycle_id):
+        """Notes that the open transaction writes to cycle_id, for the Forecaster.
+
+        A commit that touched nothing counts as a write to every cycle.
+        """
+        touched = getattr(self._local, "touched", None)
+        if touched is None:
+            touched = self._local.touched = set()
+        touched.add(cycle_id)
+
+    def release(self):
+        """Closes the calling thread's own connection, if it has opened one."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            self._local.conn = None
+            self._discard(conn)
+
+    def _discard(self, conn):
+        with self._lock:
+            if conn in self._opened:
+                self._opened.remove(conn)
+        conn.close()
+
+    def close_all(self):
+        """Closes every connection this manager has opened."""
+        with self._lock:
+            opened, self._opened = self._opened, []
+        for conn in opened:
+            conn.close()
+        self._local = threading.local()
+        if self._pool is not None:
+            self._pool = queue.LifoQueue(maxsize=self.pool_size)
+            self._read_pool = queue.LifoQueue(maxsize=self.pool_size)
+
+_manager = None
+_manager_lock = threading.Lock()
+
+def get_manager():
+    """Returns the shared ConnectionManager, recreating it if DB_NAME changed."""
+    global _manager
+    with _manager_lock:
+        if _manager is None or _manager.path != DB_NAME:
+            if _manager is not None:
+                _manager.close_all()
+            _manager = ConnectionManager(DB_NAME, pool_size=POOL_SIZE, profile=PRAGMA_PROFILE)
+        return _manager
+
+def get_connection():
+    return get_manager().get()
+
+def transaction():
+    return get_manager().transaction()
+
+def close_connections():
+    global _manager
+    close_forecaster()  # Its thread would reopen a connection
+    with _manager_lock:
+        if _manager is not None:
+            _manager.close_all()
+            _manager = None
+    _active_cycles.clear()
+
+# --- Query Result Cache ---
+# Read queries go through cached_query(), so identical SQL and parameters
+# between writes are answered from memory. Each entry remembers the generation
+# it was read at: the manager's write_seq (our own commits) plus a counter
+# bumped whenever some connection's PRAGMA data_version moves (commits by any
+# other connection or process). Entries from an older generation are never
+# served. Reads inside an open transaction bypass the cache, since they may
+# see rows that are later rolled back.
+
+QUERY_CACHE_MAX_CONNECTIONS = 64  # data_versions tracked before all are forgotten (each then counts as a change)
+
+def _result_size(key, rows):
+    # Rough footprint: containers plus values (small shared ints are over-counted).
+    size = sys.getsizeof(rows) + sys.getsizeof(key[0]) + sys.getsizeof(key[1]) + 100
+    for row in rows:
+        size += sys.getsizeof(row) + sum(map(sys.getsizeof, row))
+    return size
+
+class QueryCache:
+    """LRU map of (sql, params) -> result rows, bounded by an estimated byte size."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = self.misses = self.stale = self.evictions = 0
+        self._entries = OrderedDict()  # key -> (generation, rows, size)
+        self._versions = {}  # id(conn) -> (conn, last data_version); holding conn keeps the id from being reused
+        self._changes = 0
+        self._lock = threading.Lock()
+
+    def generation(self, conn):
+        """The current generation, as seen from conn."""
+        version = conn.execute("PRAGMA data_version").fetchone()[0]
+        with self._lock:
+            seen = self._versions.get(id(conn))
+            if seen is None or seen[1] != version:
+                # A connection seen for the first time may have missed changes too.
+                if len(self._versions) >= QUERY_CACHE_MAX_CONNECTIONS:
+                    self._versions.clear()
+                self._versions[id(conn)] = (conn, version)
+                self._changes += 1
+            return get_manager().write_seq, self._changes
+
+    def get(self, key, generation):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == generation:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                self.stale += 1
+                self._remove(key)
+            self.misses += 1
+            return None
+
+    def put(self, key, generation, rows):
+        size = _result_size(key, rows)
+        if size > self.max_bytes // 4:
+            return  # One huge result would flush everything else
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (generation, rows, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key):
+        self.bytes -= self._entries.pop(key)[2]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hits / lookups if lookups else 0.0,
+                    "stale": self.stale, "evictions": self.evictions, "entries": len(self._entries),
+                    "bytes": self.bytes, "max_bytes": self.max_bytes}
+
+_query_cache = None
+
+def get_query_cache():
+    """The shared QueryCache, or None when QUERY_CACHE_BYTES is 0."""
+    global _query_cache
+    if not QUERY_CACHE_BYTES:
+        return None
+    if _query_cache is None or _query_cache.max_bytes != QUERY_CACHE_BYTES:
+        _query_cache = QueryCache(QUERY_CACHE_BYTES)
+    return _query_cache
+
+def cached_query(sql, params=()):
+    """Runs a read query and returns all its rows, from the query cache when nothing was written since.
+
+    The returned list may be shared with other callers: do not modify it.
+    """
+    conn = get_connection()
+    cache = get_query_cache()
+    if cache is None or conn.in_transaction:
+        return conn.execute(sql, params).fetchall()
+    key = (sql, tuple(params))
+    generation = cache.generation(conn)
+    rows = cache.get(key, generation)
+    if rows is None:
+        QUERY_CACHE_MISSES.inc()
+        rows = conn.execute(sql, params).fetchall()
+        cache.put(key, generation, rows)
+    else:
+        QUERY_CACHE_HITS.inc()
+    return rows
+
+def query_cache_stats():
+    """Hits, misses, hit rate, entries and estimated bytes of the query result cache."""
+    cache = get_query_cache()
+    return cache.stats() if cache else {"hits": 0, "misses": 0, "hit_rate": 0.0, "stale": 0, "evictions": 0,
+                                        "entries": 0, "bytes": 0, "max_bytes": 0}
+
+# --- Schema ---
+# The schema is versioned with PRAGMA user_version: MIGRATIONS[i] upgrades a
+# database from version i to i + 1. Never edit a released migration, append a
+# new one instead. Each migration also checks the schema it expects, so
+# databases created before versioning (user_version 0) converge safely.
+
+@instrument
+def init_db(profile=None):
+    """Initializes the database with a 3NF Normalized Schema.
+
+    Also applies the pragma profile (PRAGMA_PROFILE unless one is given),
+    including switching the database to WAL. When the schema is current this is
+    a PRAGMA user_version read and a trigger check; otherwise pending migrations
+    run in order.
+    """
+    get_manager().set_profile(profile or get_manager().profile or PRAGMA_PROFILE)
+    conn = get_connection()
+    if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+        _run_migrations(conn)
+    _repair_totals_triggers(conn)
+
+def _run_migrations(conn):
+    """Applies each pending migration in its own IMMEDIATE transaction, bumping user_version."""
+    conn.commit()
+    # Table rebuilds swap parent tables, so foreign keys are checked explicitly instead.
+    conn.execute("PRAGMA foreign_keys = OFF")
+    try:
+        for target, migration in enumerate(MIGRATIONS, start=1):
+            with transaction() as cursor:
+                cursor.execute("BEGIN IMMEDIATE")
+                # Re-read under the write lock in case another process migrated first.
+                if cursor.execute("PRAGMA user_version").fetchone()[0] >= target:
+                    continue
+                migration(cursor)
+                if cursor.execute("PRAGMA foreign_key_check").fetchone():
+                    raise sqlite3.IntegrityError(f"foreign key violations after {migration.__name__}")
+                cursor.execute(f"PRAGMA user_version = {target}")
+    finally:
+        conn.execute("PRAGMA foreign_keys = ON")
+
+def _migrate_base_tables(cursor):
     # 1. Cycles Table (Normalization: Separating time periods)
     cursor.execute('''CREATE TABLE IF NOT EXISTS cycles (
                         id INTEGER PRIMARY KEY AUTOINCREMENT,
                         start_date TEXT,
                         end_date TEXT,
-                        initial_income REAL)''')
+                        initial_income INTEGER,
+                        start_day INTEGER,
+                        end_day INTEGER)''')
 
     # 2. Transactions Table (Linked via Foreign Key)
     cursor.execute('''CREATE TABLE IF NOT EXISTS transactions (
@@ -23,108 +551,1473 @@ def init_db():
                         cycle_id INTEGER,
                         type TEXT,
                         category TEXT,
-                        amount REAL,
+                        amount INTEGER,
                         description TEXT,
                         timestamp TEXT,
+                        ts_epoch INTEGER,
                         FOREIGN KEY(cycle_id) REFERENCES cycles(id))''')
-    
-    # 3. SQL View for Reporting (Shows DQL proficiency)
-    cursor.execute('''CREATE VIEW IF NOT EXISTS v_cycle_summary AS 
-                      SELECT cycle_id, type, SUM(amount) as total 
-                      FROM transactions GROUP BY cycle_id, type''')
-    
-    conn.commit()
-    conn.close()
+
+def _migrate_amounts_to_cents(cursor):
+    """Rewrites a database that still stores REAL amounts so they are INTEGER cents.
+
+    SQLite cannot change a column's type in place, so cycles and transactions
+    are rebuilt and cycle_totals is dropped for the next migration to recompute.
+    """
+    columns = {row[1]: row[2] for row in cursor.execute("PRAGMA table_info(transactions)")}
+    if columns.get("amount", "").upper() != "REAL":
+        return
+    # Rows written by the old add_transaction had amount and category swapped.
+    swapped = "(typeof(amount) = 'text' AND CAST(category AS REAL) > 0)"
+    cursor.execute("DROP VIEW IF EXISTS v_cycle_summary")
+    for trigger in ("insert", "delete", "update"):
+        cursor.execute(f"DROP TRIGGER IF EXISTS trg_transactions_totals_{trigger}")
+    cursor.execute("DROP TABLE IF EXISTS cycle_totals")
+    # Round like to_cents() does for new entries (half-up on the typed decimal), not ROUND() on the binary float.
+    cursor.create_function("to_cents", 1, _migrate_cents, deterministic=True)
+    cursor.execute('''CREATE TABLE cycles_new (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        start_date TEXT,
+                        end_date TEXT,
+                        initial_income INTEGER)''')
+    cursor.execute('''INSERT INTO cycles_new (id, start_date, end_date, initial_income)
+                      SELECT id, start_date, end_date, to_cents(initial_income)
+                      FROM cycles''')
+    cursor.execute("DROP TABLE cycles")
+    cursor.execute("ALTER TABLE cycles_new RENAME TO cycles")
+    cursor.execute('''CREATE TABLE transactions_new (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        cycle_id INTEGER,
+                        type TEXT,
+                        category TEXT,
+                        amount INTEGER,
+                        description TEXT,
+                        timestamp TEXT,
+                        FOREIGN KEY(cycle_id) REFERENCES cycles(id))''')
+    cursor.execute(f'''INSERT INTO transactions_new
+                       SELECT id, cycle_id, type,
+                              CASE WHEN {swapped} THEN amount ELSE category END,
+                              to_cents(CASE WHEN {swapped} THEN category ELSE amount END),
+                              description, timestamp
+                       FROM transactions''')
+    cursor.execute("DROP TABLE transactions")
+    cursor.execute("ALTER TABLE transactions_new RENAME TO transactions")
+
+def _migrate_cents(value):
+    if value is None:
+        return None
+    try:
+        return to_cents(value)
+    except (TypeError, ValueError):
+        return 0  # Not a number: what CAST(... AS REAL) made of it before
+
+def _migrate_epoch_columns(cursor):
+    """Adds and backfills the integer time columns on databases created before they existed."""
+    cycle_columns = {row[1] for row in cursor.execute("PRAGMA table_info(cycles)")}
+    if "start_day" not in cycle_columns:
+        cursor.execute("ALTER TABLE cycles ADD COLUMN start_day INTEGER")
+        cursor.execute("ALTER TABLE cycles ADD COLUMN end_day INTEGER")
+        cursor.execute('''UPDATE cycles SET
+                            start_day = CAST(julianday(start_date) - 2440587.5 AS INTEGER),
+                            end_day = CAST(julianday(end_date) - 2440587.5 AS INTEGER)''')
+    transaction_columns = {row[1] for row in cursor.execute("PRAGMA table_info(transactions)")}
+    if "ts_epoch" not in transaction_columns:
+        cursor.execute("ALTER TABLE transactions ADD COLUMN ts_epoch INTEGER")
+        cursor.execute("UPDATE transactions SET ts_epoch = CAST(strftime('%s', timestamp) AS INTEGER)")
+
+def _migrate_cycle_totals(cursor):
+    # 3. Materialized per-cycle totals, kept current by triggers on transactions
+    has_totals = cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'cycle_totals'").fetchone()
+    cursor.execute('''CREATE TABLE IF NOT EXISTS cycle_totals (
+                        cycle_id INTEGER NOT NULL,
+                        type TEXT NOT NULL,
+                        category TEXT NOT NULL,
+                        total INTEGER NOT NULL DEFAULT 0,
+                        n INTEGER NOT NULL DEFAULT 0,
+                        PRIMARY KEY (cycle_id, type, category)) WITHOUT ROWID''')
+    _create_totals_triggers(cursor)
+    if not has_totals:
+        _rebuild_cycle_totals(cursor)
+
+    # 4. SQL View for Reporting (Shows DQL proficiency), served from cycle_totals
+    cursor.execute("DROP VIEW IF EXISTS v_cycle_summary")
+    cursor.execute('''CREATE VIEW v_cycle_summary AS 
+                      SELECT cycle_id, type, SUM(total) as total 
+                      FROM cycle_totals GROUP BY cycle_id, type''')
+
+def _migrate_indexes(cursor):
+    # 5. Covering indexes for the per-cycle aggregates (no table scans as history grows)
+    cursor.execute('''CREATE INDEX IF NOT EXISTS idx_transactions_cycle_type
+                      ON transactions (cycle_id, type, category, amount)''')
+    cursor.execute("""CREATE INDEX IF NOT EXISTS idx_transactions_expense
+                      ON transactions (cycle_id, category, amount) WHERE type = 'expense'""")
+
+    # 6. Integer time indexes for date-range queries
+    cursor.execute('''CREATE INDEX IF NOT EXISTS idx_transactions_type_ts
+                      ON transactions (type, ts_epoch, category, amount)''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_cycles_start_day ON cycles (start_day)")
+
+def _migrate_drop_expense_index(cursor):
+    # Reports read cycle_totals now, so the partial expense index only slowed inserts down.
+    cursor.execute("DROP INDEX IF EXISTS idx_transactions_expense")
+
+def _migrate_content_hash(cursor):
+    # 7. Identity of imported statement lines, so re-imports skip rows already stored.
+    # Manual entries keep NULL: two identical coffees on one day are both real.
+    if "content_hash" not in {row[1] for row in cursor.execute("PRAGMA table_info(transactions)")}:
+        cursor.execute("ALTER TABLE transactions ADD COLUMN content_hash INTEGER")
+    cursor.execute("""CREATE UNIQUE INDEX IF NOT EXISTS idx_transactions_content_hash
+                      ON transactions (content_hash) WHERE content_hash IS NOT NULL""")
+
+MIGRATIONS = [
+    _migrate_base_tables,
+    _migrate_amounts_to_cents,
+    _migrate_epoch_columns,
+    _migrate_cycle_totals,
+    _migrate_indexes,
+    _migrate_drop_expense_index,
+    _migrate_content_hash,
+]
+SCHEMA_VERSION = len(MIGRATIONS)
+
+def _create_totals_triggers(cursor):
+    add_new = """INSERT INTO cycle_totals (cycle_id, type, category, total, n)
+                 SELECT NEW.cycle_id, NEW.type, IFNULL(NEW.category, 'Misc'), NEW.amount, 1
+                 WHERE NEW.cycle_id IS NOT NULL AND NEW.type IS NOT NULL
+                 ON CONFLICT (cycle_id, type, category)
+                 DO UPDATE SET total = total + excluded.total, n = n + 1;"""
+    remove_old = """UPDATE cycle_totals SET total = total - OLD.amount, n = n - 1
+                    WHERE cycle_id = OLD.cycle_id AND type = OLD.type
+                      AND category = IFNULL(OLD.category, 'Misc');
+                    DELETE FROM cycle_totals
+                    WHERE cycle_id = OLD.cycle_id AND type = OLD.type
+                      AND category = IFNULL(OLD.category, 'Misc') AND n <= 0;"""
+    cursor.execute(f"""CREATE TRIGGER IF NOT EXISTS trg_transactions_totals_insert
+                       AFTER INSERT ON transactions BEGIN {add_new} END""")
+    cursor.execute(f"""CREATE TRIGGER IF NOT EXISTS trg_transactions_totals_delete
+                       AFTER DELETE ON transactions BEGIN {remove_old} END""")
+    cursor.execute(f"""CREATE TRIGGER IF NOT EXISTS trg_transactions_totals_update
+                       AFTER UPDATE OF cycle_id, type, category, amount ON transactions
+                       BEGIN {remove_old} {add_new} END""")
+
+TOTALS_TRIGGERS = ("trg_transactions_totals_insert", "trg_transactions_totals_delete",
+                   "trg_transactions_totals_update")
+
+def _repair_totals_triggers(conn):
+    # Older bulk loads could commit with the insert trigger dropped; restore it
+    # and the totals it missed. Not a migration: user_version was bumped long ago.
+    query = "SELECT count(*) FROM sqlite_master WHERE type = 'trigger' AND name IN (?, ?, ?)"
+    if conn.execute(query, TOTALS_TRIGGERS).fetchone()[0] == len(TOTALS_TRIGGERS):
+        return
+    with transaction() as cursor:
+        if not cursor.in_transaction:
+            cursor.execute("BEGIN IMMEDIATE")
+        # Re-check under the write lock in case another process repaired it first.
+        if cursor.execute(query, TOTALS_TRIGGERS).fetchone()[0] < len(TOTALS_TRIGGERS):
+            _create_totals_triggers(cursor)
+            _rebuild_cycle_totals(cursor)
+
+def _rebuild_cycle_totals(cursor):
+    cursor.execute("DELETE FROM cycle_totals")
+    cursor.execute("INSERT INTO cycle_totals (cycle_id, type, category, total, n) " + _RECOMPUTE_TOTALS_SQL)
+
+@instrument
+def rebuild_cycle_totals():
+    """Recomputes cycle_totals from scratch, e.g. after editing transactions with triggers off."""
+    with transaction() as conn:
+        _rebuild_cycle_totals(conn)
+
+@instrument
+def check_cycle_totals():
+    """Compares cycle_totals against a full recompute of transactions.
+
+    Returns a list of (cycle_id, type, category, stored_total, expected_total)
+    mismatches; an empty list means the materialized totals are consistent.
+    """
+    conn = get_connection()
+    stored = {row[:3]: row[3:] for row in conn.execute("SELECT cycle_id, type, category, total, n FROM cycle_totals")}
+    expected = {row[:3]: row[3:] for row in conn.execute(_RECOMPUTE_TOTALS_SQL)}
+    mismatches = []
+    for key in sorted(stored.keys() | expected.keys(), key=repr):
+        (s_total, s_n), (e_total, e_n) = stored.get(key, (None, 0)), expected.get(key, (None, 0))
+        if s_n != e_n or s_total != e_total:
+            mismatches.append((*key, s_total, e_total))
+    return mismatches
+
+@instrument
+def check_query_plans():
+    """Runs EXPLAIN QUERY PLAN on every hot query and returns those that scan a HOT_TABLES table.
+
+    An empty result means every hot query is served by an index.
+    """
+    conn = get_connection()
+    failures = {}
+    for name, (sql, params) in HOT_QUERIES.items():
+        plan = [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params)]
+        if any(step.split()[1] in HOT_TABLES and "INDEX" not in step and "PRIMARY KEY" not in step
+               for step in plan if len(step.split()) > 1):
+            failures[name] = plan
+    return failures
+
+# --- Charting ---
+
+class ChartRenderer:
+    """Draws spending charts on one reusable, non-interactive Agg figure.
+
+    matplotlib is imported when the renderer is created (on the first chart
+    request), and the same figure and canvas are cleared and redrawn for every
+    chart, so long sessions do not pile up figures the way plt.figure() did.
+    """
+
+    VERSION = 1  # Bump when chart styling changes so cached PNGs are re-rendered
+    FIGSIZE = (10, 6)
+
+    def __init__(self):
+        from matplotlib import cm
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+        self.figure = Figure(figsize=self.FIGSIZE)
+        self.canvas = FigureCanvasAgg(self.figure)
+        self.colors = cm.Paired.colors
+        self._lock = threading.Lock()
+
+    @classmethod
+    def settings(cls):
+        """Everything besides the data that affects the rendered PNG (part of the cache key)."""
+        return {"version": cls.VERSION, "kind": "pie", "figsize": list(cls.FIGSIZE), "colormap": "Paired"}
+
+    @instrument
+    def render_pie(self, labels, values, title, path):
+        """Saves a pie chart of values to path as PNG, releasing its artists afterwards."""
+        start = time.perf_counter()
+        with self._lock:
+            fig = self.figure
+            fig.clear()
+            with timed("chart:draw"):
+                ax = fig.add_subplot()
+                ax.pie(values, labels=labels, autopct='%1.1f%%', startangle=140, colors=self.colors)
+                ax.set_title(title)
+                ax.axis('equal')
+            with timed("chart:savefig"):
+                fig.savefig(path, format="png")
+            fig.clear()
+        CHART_RENDER_SECONDS.observe(time.perf_counter() - start)
+
+    def close(self):
+        with self._lock:
+            self.figure.clear()
+            self.figure = self.canvas = None
+
+_renderer = None
+
+def get_renderer():
+    """Returns the shared ChartRenderer, creating it (and importing matplotlib) on first use."""
+    global _renderer
+    if _renderer is None:
+        _renderer = ChartRenderer()
+    return _renderer
+
+def close_renderer():
+    global _renderer
+    if _renderer is not None:
+        _renderer.close()
+        _renderer = None
+
+class ChartCache:
+    """Content-addressed PNG cache in a directory, evicted least-recently-used first.
+
+    Entries are keyed by a hash of the chart's aggregated data plus its render
+    settings, so an unchanged cycle is served from disk without re-rendering.
+    """
+
+    def __init__(self, directory, max_bytes=None, max_entries=None):
+        self.directory = directory
+        self.max_bytes = max_bytes or CHART_CACHE_MAX_BYTES
+        self.max_entries = max_entries or CHART_CACHE_MAX_ENTRIES
+
+    def key(self, data, settings):
+        payload = json.dumps([settings, data], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".png")
+
+    def get(self, key):
+        """Returns the cached PNG path for key (marking it recently used), or None."""
+        path = self._path(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def put(self, key, render):
+        """Calls render(tmp_path), stores the result under key and returns its path."""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        tmp = f"{path[:-4]}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            render(tmp)
+            os.replace(tmp, path)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        self.evict()
+        return path
+
+    def evict(self):
+        """Deletes least-recently-used entries until the size and count limits hold."""
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(".png"):
+                    st = entry.stat()
+                    entries.append((st.st_mtime, st.st_size, entry.path))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        while entries and (total > self.max_bytes or len(entries) > self.max_entries):
+            _, size, path = entries.pop(0)
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+_chart_cache = None
+
+def get_chart_cache():
+    global _chart_cache
+    if _chart_cache is None or _chart_cache.directory != CHART_CACHE_DIR:
+        _chart_cache = ChartCache(CHART_CACHE_DIR)
+    return _chart_cache
 
 # --- Core Logic Functions ---
 
+class CycleNotFound(ValueError):
+    """Raised when a cycle id (or the current cycle) does not exist."""
+
+@instrument
 def get_current_cycle():
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM cycles ORDER BY id DESC LIMIT 1")
-    row = cursor.fetchone()
-    conn.close()
-    return row
+    rows = cached_query("SELECT * FROM cycles ORDER BY id DESC LIMIT 1")
+    return rows[0] if rows else None
 
+@instrument
+def get_cycles():
+    """[(id, start_date, end_date, initial_income)] of every cycle, oldest first."""
+    rows = cached_query("SELECT id, start_date, end_date, initial_income FROM cycles ORDER BY id")
+    return [(cid, start, end, from_cents(income)) for cid, start, end, income in rows]
+
+@instrument
 def start_new_cycle(income, rollover=0.0):
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    start = date.today().isoformat()
-    end = (date.today() + timedelta(days=30)).isoformat()
-    total_income = income + rollover
-    
-    cursor.execute("INSERT INTO cycles (start_date, end_date, initial_income) VALUES (?, ?, ?)",
-                   (start, end, total_income))
-    cycle_id = cursor.lastrowid
+    start = date.today()
+    end = start + timedelta(days=30)
+    total_income = to_cents(income) + to_cents(rollover)
+    now = datetime.now()
     
-    cursor.execute("INSERT INTO transactions (cycle_id, type, category, amount, description, timestamp) VALUES (?, ?, ?, ?, ?, ?)",
-                   (cycle_id, 'income', 'Salary', total_income, 'Initial Cycle Funds', datetime.now().isoformat()))
-    
-    conn.commit()
-    conn.close()
+    with transaction() as conn:
+        cursor = conn.execute("""INSERT INTO cycles (start_date, end_date, initial_income, start_day, end_day)
+                                 VALUES (?, ?, ?, ?, ?)""",
+                              (start.isoformat(), end.isoformat(), total_income, to_day(start), to_day(end)))
+        cycle_id = cursor.lastrowid
+        get_manager().touch(cycle_id)
+        
+        conn.execute(INSERT_TRANSACTION_SQL,
+                     (cycle_id, 'income', 'Salary', total_income, 'Initial Cycle Funds', now.isoformat(), to_epoch(now)))
+    TRANSACTIONS_INSERTED.inc()
     return cycle_id
 
-def add_transaction(cycle_id, t_type, amount, category, desc):
-    """Saves a transaction to the DB safely using Parameterized Queries."""
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    cursor.execute("""
-        INSERT INTO transactions (cycle_id, type, category, amount, description, timestamp) 
-        VALUES (?, ?, ?, ?, ?, ?)
-    """, (cycle_id, t_type, amount, category, desc, datetime.now().isoformat()))
-    conn.commit()
-    conn.close()
-    print(f"\n✅ Successfully added {category}: ${amount:,.2f}")
+@instrument
+def add_transaction(cycle_id, t_type, amount, category, desc, quiet=False):
+    """Saves a transaction to the DB safely using Parameterized Queries. Returns its id.
 
-def calculate_burn_rate(cycle_id):
-    """Predictive Logic: Forecasts financial runway based on spend velocity."""
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    
-    cursor.execute("SELECT start_date FROM cycles WHERE id = ?", (cycle_id,))
-    start_str = cursor.fetchone()[0]
-    start_date = datetime.strptime(start_str, "%Y-%m-%d")
-    
+    With write-behind enabled the row is only queued and None is returned,
+    unless the caller is inside transaction(), whose atomicity wins.
+    """
+    now = datetime.now()
+    row = (cycle_id, t_type, category, to_cents(amount), desc, now.isoformat(), to_epoch(now))
+    buffer = _write_behind
+    if buffer is not None and not get_manager().in_transaction():
+        buffer.add(row)
+        row_id = None
+    else:
+        manager = get_manager()
+        seq = manager.write_seq
+        with transaction() as conn:
+            row_id = conn.execute(INSERT_TRANSACTION_SQL, row).lastrowid
+            manager.touch(cycle_id)
+        TRANSACTIONS_INSERTED.inc()
+        if _active_cycles and not manager.in_transaction():
+            _note_insert(conn, seq, manager.write_seq, row_id, row)
+    if not quiet:
+        print(f"\n✅ Successfully added {category}: ${amount:,.2f}")
+    return row_id
+
+def prepare_transaction_row(cycle_id, row):
+    """Validates one (type, amount, category, description, timestamp) tuple.
+
+    Returns the parameter tuple for INSERT_TRANSACTION_SQL.
+    """
+    t_type, amount, category, desc, timestamp = row
+    if t_type not in TRANSACTION_TYPES:
+        raise ValueError(f"type must be one of {TRANSACTION_TYPES}, got {t_type!r}")
+    cents = to_cents(amount)
+    if cents <= 0:
+        raise ValueError(f"amount must be positive, got {amount!r}")
+    if timestamp is None:
+        moment = datetime.now()
+        text = moment.isoformat()
+    elif isinstance(timestamp, str):
+        # Naive ISO strings (the common bulk case) are stored as given.
+        moment, text = datetime.fromisoformat(timestamp), timestamp
+        if moment.tzinfo is not None:
+            moment = _as_datetime(moment)
+            text = moment.isoformat()
+    else:
+        moment = _as_datetime(timestamp)
+        text = moment.isoformat()
+    return (cycle_id, t_type, category or "Misc", cents, desc, text, (moment - _EPOCH) // _SECOND)
+
+@instrument
+def add_transactions(cycle_id, rows, batch_size=None):
+    """Bulk-inserts (type, amount, category, description, timestamp) rows in one transaction.
+
+    Rows may come from any iterable or generator; they are validated and written
+    in executemany batches, so memory stays bounded by the batch size. Nothing is
+    committed if any row is invalid. Returns the number of rows inserted.
+    """
+    batch_size = batch_size or BULK_BATCH_SIZE
+    rows = enumerate(rows, start=1)
+    number = 0
+    with transaction() as conn, BulkWriter(conn) as writer:
+        while True:
+            batch = []
+            try:
+                for number, row in islice(rows, batch_size):
+                    batch.append(prepare_transaction_row(cycle_id, row))
+            except (TypeError, ValueError) as e:
+                raise ValueError(f"Invalid transaction row #{number}: {e}") from e
+            if not batch:
+                break
+            writer.write(batch)
+    TRANSACTIONS_INSERTED.inc(writer.inserted)
+    return writer.inserted
+
+class BulkWriter:
+    """Writes prepare_transaction_row() tuples inside the caller's open transaction.
+
+    Firing the cycle_totals insert trigger per row dominates large loads, so once
+    a batch reaches BULK_DEFER_TOTALS_ROWS the trigger is dropped for the rest of
+    the transaction. The batch totals are then folded into cycle_totals by
+    finish(), which recreates the trigger. abort() undoes the rows and the
+    trigger drop together, so a failed load never leaves the trigger missing
+    even when an outer transaction (e.g. --batch) carries on and commits. Use
+    it as a context manager to get finish() on success and abort() on error:
+
+        with transaction() as conn, BulkWriter(conn) as writer:
+            writer.write(rows)
+    """
+
+    def __init__(self, conn, sql=INSERT_TRANSACTION_SQL):
+        self.conn = conn
+        self.sql = sql
+        self.inserted = 0
+        self._totals = None
+        self._started = False
+        self._savepoint = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.finish()
+        else:
+            self.abort()
+
+    def write(self, batch):
+        conn = self.conn
+        if not self._started:
+            # Joining earlier work, only a savepoint can undo ours alone. Rows
+            # firing the trigger inside one are slow with temp_store=MEMORY (the
+            # statement journal), so totals are then always deferred.
+            self._started, self._savepoint = True, conn.in_transaction
+            conn.execute("SAVEPOINT bulk_writer" if self._savepoint else "BEGIN")
+        if self._totals is None and (self._savepoint or len(batch) >= BULK_DEFER_TOTALS_ROWS):
+            conn.execute("DROP TRIGGER IF EXISTS trg_transactions_totals_insert")
+            self._totals = {}
+        conn.executemany(self.sql, batch)
+        self.inserted += len(batch)
+        manager = get_manager()
+        for cycle_id in {row[0] for row in batch}:
+            manager.touch(cycle_id)
+        if self._totals is not None:
+            totals = self._totals
+            for row in batch:
+                key = (row[0], row[1], row[2])
+                entry = totals.get(key)
+                if entry is None:
+                    totals[key] = [row[3], 1]
+                else:
+                    entry[0] += row[3]
+                    entry[1] += 1
+
+    def finish(self):
+        """Folds deferred totals into cycle_totals and restores the trigger."""
+        if self._totals is not None:
+            self.conn.executemany("""
+                INSERT INTO cycle_totals (cycle_id, type, category, total, n) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (cycle_id, type, category) DO UPDATE SET total = total + excluded.total, n = n + excluded.n""",
+                [(*key, total, n) for key, (total, n) in self._totals.items()])
+            _create_totals_triggers(self.conn)
+            self._totals = None
+        if self._savepoint:
+            self.conn.execute("RELEASE bulk_writer")
+        self._started = self._savepoint = False
+
+    def abort(self):
+        """Rolls back every row written since the first write(), and the trigger drop with them."""
+        if self._started and self.conn.in_transaction:  # A failed COMMIT may have rolled back already
+            if self._savepoint:
+                self.conn.execute("ROLLBACK TO bulk_writer")
+                self.conn.execute("RELEASE bulk_writer")
+            else:
+                self.conn.rollback()
+        self._started = self._savepoint = False
+        self._totals = None
+        self.inserted = 0
+
+# --- Write-behind ---
+# Optional: add_transaction queues rows and a background thread commits them in
+# batches, so a burst of single adds shares one commit (and fsync) instead of
+# paying one each. Queued rows are not visible to reads until they commit.
+
+class WriteBehindBuffer:
+    """Commits queued INSERT_TRANSACTION_SQL rows from a flusher thread, in batches.
+
+    A batch commits once it holds max_rows rows or its oldest row has waited
+    max_delay_ms. on_commit(rows) is then called on the flusher thread with the
+    rows now durable. If the batch fails, its rows are retried one by one, each
+    in its own SAVEPOINT, so the good rows still commit and only a failing row
+    is reported, through on_error([row], exc) or, without on_error, as the error
+    raised by the next flush() or close().
+    """
+
+    def __init__(self, max_rows=None, max_delay_ms=None, on_commit=None, on_error=None):
+        self.max_rows = max_rows or WRITE_BEHIND_ROWS
+        self.max_delay = (WRITE_BEHIND_MS if max_delay_ms is None else max_delay_ms) / 1000
+        self.on_commit = on_commit
+        self.on_error = on_error
+        self.commits = 0
+        self._rows = []
+        self._oldest = 0.0
+        self._queued = self._done = 0  # Rows ever queued / committed or failed
+        self._flush_to = 0
+        self._closed = False
+        self._error = None
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+        self._thread.start()
+
+    def add(self, row):
+        with self._cond:
+            if self._closed:
+                raise ValueError("The write-behind buffer is closed")
+            rows = self._rows
+            rows.append(row)
+            self._queued += 1
+            if len(rows) == 1:
+                self._oldest = time.monotonic()
+                self._cond.notify_all()
+            elif len(rows) >= self.max_rows:
+                self._cond.notify_all()
+
+    def flush(self, timeout=None):
+        """Blocks until every row queued so far is committed (or failed)."""
+        with self._cond:
+            self._flush_to = target = self._queued
+            self._cond.notify_all()
+            if not self._cond.wait_for(lambda: self._done >= target, timeout):
+                raise TimeoutError(f"write-behind flush did not finish within {timeout}s")
+            error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def close(self):
+        """Commits what is queued and stops the flusher thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def _next_batch(self):
+        with self._cond:
+            while True:
+                rows = self._rows
+                if rows and (len(rows) >= self.max_rows or self._closed or self._flush_to > self._done):
+                    break
+                if not rows and self._closed:
+                    return None
+                timeout = self._oldest + self.max_delay - time.monotonic() if rows else None
+                if timeout is not None and timeout <= 0:
+                    break
+                self._cond.wait(timeout)
+            self._rows = []
+            return rows
+
+    def _run(self):
+        while True:
+            rows = self._next_batch()
+            if rows is None:
+                get_manager().release()
+                return
+            try:
+                with transaction() as conn, BulkWriter(conn) as writer:
+                    writer.write(rows)
+                committed, failed = rows, []
+            except sqlite3.Error:
+                committed, failed = self._write_singly(rows)
+            if committed:
+                TRANSACTIONS_INSERTED.inc(len(committed))
+                self.commits += 1
+                self._notify(self.on_commit, committed)
+            for row, error in failed:
+                self._notify(self.on_error, [row], error)
+            with self._cond:
+                self._done += len(rows)
+                self._cond.notify_all()
+
+    def _write_singly(self, rows):
+        # add_transaction already returned for every row, so one bad row must not sink the rest.
+        committed, failed = [], []
+        manager = get_manager()
+        try:
+            with transaction() as conn:
+                if not conn.in_transaction:
+                    conn.execute("BEGIN IMMEDIATE")  # Or the first RELEASE below would commit on its own
+                for row in rows:
+                    conn.execute("SAVEPOINT write_behind_row")
+                    try:
+                        conn.execute(INSERT_TRANSACTION_SQL, row)
+                    except sqlite3.Error as e:
+                        conn.execute("ROLLBACK TO write_behind_row")
+                        failed.append((row, e))
+                    else:
+                        manager.touch(row[0])
+                        committed.append(row)
+                    conn.execute("RELEASE write_behind_row")
+        except sqlite3.Error as e:  # The commit itself failed: none of the rows is durable
+            return [], [(row, e) for row in rows]
+        return committed, failed
+
+    def _notify(self, callback, rows, error=None):
+        try:
+            if error is None:
+                if callback is not None:
+                    callback(rows)
+            elif callback is not None:
+                callback(rows, error)
+            else:
+                self._error = error
+        except Exception as e:  # A failing callback must not stop the flusher
+            self._error = e
+
+_write_behind = None
+
+def enable_write_behind(max_rows=None, max_delay_ms=None, on_commit=None, on_error=None):
+    """Switches add_transaction to write-behind; returns the new WriteBehindBuffer.
+
+    Call flush() before reading back what was added, and disable_write_behind()
+    (also run at exit) to commit the rest.
+    """
+    global _write_behind
+    disable_write_behind()
+    _write_behind = WriteBehindBuffer(max_rows, max_delay_ms, on_commit, on_error)
+    return _write_behind
+
+@atexit.register
+def disable_write_behind():
+    """Commits queued rows and makes add_transaction write directly again."""
+    global _write_behind
+    buffer, _write_behind = _write_behind, None
+    if buffer is not None:
+        buffer.close()
+
+def _forecast(start_day, total_income, total_spent, today=None):
+    """Turns a cycle's start day number and cent totals into (balance, daily_rate, runway).
+
+    Arithmetic stays in integer cents; only the returned figures are floats.
+    """
     # Calculate days passed (minimum 1 to avoid division by zero)
-    days_passed = (datetime.now() - start_date).days + 1
-    
-    cursor.execute("SELECT SUM(amount) FROM transactions WHERE cycle_id = ? AND type = 'expense'", (cycle_id,))
-    total_spent = cursor.fetchone()[0] or 0
-    
-    cursor.execute("SELECT SUM(amount) FROM transactions WHERE cycle_id = ? AND type = 'income'", (cycle_id,))
-    total_income = cursor.fetchone()[0] or 0
+    days_passed = (today if today is not None else to_day(date.today())) - start_day + 1
     
     balance = total_income - total_spent
-    daily_rate = total_spent / days_passed
-    runway = balance / daily_rate if daily_rate > 0 else 0
-    
-    conn.close()
-    return balance, daily_rate, runway
+    runway = balance * days_passed / total_spent if total_spent > 0 else 0
+    return from_cents(balance), from_cents(total_spent / days_passed), runway
+
+@instrument
+def calculate_burn_rate(cycle_id):
+    """Predictive Logic: Forecasts financial runway based on spend velocity.
+
+    Balance, spend and start date come from a single conditional-aggregation query.
+    """
+    # Inside transaction() the forecast may include rows that are later rolled back.
+    manager = _manager
+    if FORECAST_CACHE and not (manager is not None and manager.in_transaction()):
+        return get_forecaster().get(cycle_id)
+    return _calculate_burn_rate(cycle_id)
+
+def _calculate_burn_rate(cycle_id):
+    start = time.perf_counter()
+    cached = active_cycle(cycle_id) if ACTIVE_CYCLE_CACHE else None
+    if cached is not None:
+        forecast = cached.forecast()
+    else:
+        rows = cached_query(HOT_QUERIES["burn_rate"][0], (cycle_id,))
+        if not rows:
+            raise CycleNotFound(f"No cycle with id {cycle_id}")
+        _, start_day, total_income, total_spent = rows[0]
+        forecast = _forecast(start_day, total_income, total_spent)
+    BURN_RATE_SECONDS.observe(time.perf_counter() - start)
+    return forecast
+
+@instrument
+def calculate_burn_rates(cycle_ids=None):
+    """Forecasts every cycle (or just cycle_ids) at once: {cycle_id: (balance, daily_rate, runway)}."""
+    if cycle_ids is None:
+        rows = cached_query(HOT_QUERIES["burn_rate_all"][0])
+    else:
+        ids, rows = list(cycle_ids), []
+        for i in range(0, len(ids), 500):
+            chunk = ids[i:i + 500]
+            where = f"WHERE cycles.id IN ({', '.join('?' * len(chunk))})"
+            rows += cached_query(_BURN_RATE_SQL.format(where=where), chunk)
+    today = to_day(date.today())
+    return {cycle_id: _forecast(start_day, income, spent, today) for cycle_id, start_day, income, spent in rows}
+
+# --- Active Cycle Cache ---
+# A session keeps working on the newest cycle, so with ACTIVE_CYCLE_CACHE its
+# transactions are held in memory as parallel arrays, with running totals, and
+# forecasts and category breakdowns skip SQL. Each copy belongs to the connection
+# that loaded it. It stays valid while that connection's PRAGMA data_version
+# (bumped by commits on other connections) and the manager's write_seq (commits
+# through transaction() on any connection of ours) are unchanged;
+# add_transaction appends its own rows, and any other change triggers refresh().
+# Inside an open transaction reads go to SQL, as with the query cache.
+
+_TYPE_CODES = {t_type: code for code, t_type in enumerate(TRANSACTION_TYPES)}
+_INCOME, _EXPENSE = _TYPE_CODES['income'], _TYPE_CODES['expense']
+_ACTIVE_CYCLE_SQL = """SELECT id, type, IFNULL(category, 'Misc'), amount, ts_epoch FROM transactions
+                        WHERE {plus}cycle_id = ? AND id > ? AND {plus}type IN ('income', 'expense')"""
+ACTIVE_CYCLE_MAX_CONNECTIONS = 32  # Copies kept before all are dropped (closed pool connections leave some behind)
+
+class ActiveCycle:
+    """Columnar in-memory copy of one cycle's income and expense transactions."""
+
+    def __init__(self, conn, cycle_id, start_day):
+        self.conn = conn
+        self.cycle_id = cycle_id
+        self.start_day = start_day
+        self.data_version = self.write_seq = None
+        self._clear()
+
+    def _clear(self):
+        self.amounts = array("q")  # Cents
+        self.types = array("b")  # Index into TRANSACTION_TYPES
+        self.categories = array("i")  # Index into category_names
+        self.days = array("i")  # Days since the cycle's start_day
+        self.category_names = []
+        self._category_codes = {}
+        self.totals = [0] * len(TRANSACTION_TYPES)  # Cents per type
+        self.counts = [0] * len(TRANSACTION_TYPES)
+        self.category_cents = [array("q") for _ in TRANSACTION_TYPES]  # [type code][category code]
+        self.category_counts = [array("i") for _ in TRANSACTION_TYPES]
+        self.max_id = 0
+
+    @classmethod
+    def load(cls, conn, cycle_id):
+        """Reads the cycle from conn; returns None if it does not exist."""
+        row = conn.execute("SELECT start_day FROM cycles WHERE id = ?", (cycle_id,)).fetchone()
+        if row is None:
+            return None
+        cycle = cls(conn, cycle_id, row[0])
+        cycle.refresh(full=True)
+        return cycle
+
+    def is_current(self):
+        return (self.write_seq == get_manager().write_seq
+                and self.data_version == self.conn.execute("PRAGMA data_version").fetchone()[0])
+
+    def refresh(self, full=False):
+        """Catches up with rows committed since the last check.
+
+        Transactions are append-only here, so only rows past max_id are read;
+        if the per-(type, category) sums then disagree with cycle_totals (an
+        external update or delete), the whole cycle is reloaded. Edits that
+        keep every sum, like a new timestamp, change nothing served from here.
+        """
+        conn = self.conn
+        self.write_seq = get_manager().write_seq
+        self.data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+        if full:
+            self._clear()
+        # A catch-up scans the rowid range past max_id (unary + keeps SQLite off the other indexes).
+        rows = conn.execute(_ACTIVE_CYCLE_SQL.format(plus="" if full else "+"),
+                            (self.cycle_id, self.max_id))
+        append = self.append
+        for row in rows:
+            append(*row)
+        if not full:
+            stored = {(t_type, category): (total, n) for t_type, category, total, n in conn.execute(
+                """SELECT type, category, total, n FROM cycle_totals
+                   WHERE cycle_id = ? AND type IN ('income', 'expense') AND n > 0""", (self.cycle_id,))}
+            if stored != self._sums():
+                self.refresh(full=True)
+
+    def _sums(self):
+        # {(type, category): (cents, count)}, shaped like the cycle_totals rows.
+        names = self.category_names
+        return {(t_type, names[code]): (self.category_cents[type_code][code], n)
+                for t_type, type_code in _TYPE_CODES.items()
+                for code, n in enumerate(self.category_counts[type_code]) if n}
+
+    def append(self, row_id, t_type, category, cents, ts_epoch):
+        code = self._category_codes.get(category)
+        if code is None:
+            code = self._category_codes[category] = len(self.category_names)
+            self.category_names.append(category)
+            for cents_by_code, counts_by_code in zip(self.category_cents, self.category_counts):
+                cents_by_code.append(0)
+                counts_by_code.append(0)
+        type_code = _TYPE_CODES[t_type]
+        self.amounts.append(cents)
+        self.types.append(type_code)
+        self.categories.append(code)
+        self.days.append(ts_epoch // 86400 - self.start_day)
+        self.totals[type_code] += cents
+        self.counts[type_code] += 1
+        self.category_cents[type_code][code] += cents
+        self.category_counts[type_code][code] += 1
+        if row_id > self.max_id:
+            self.max_id = row_id
+
+    def forecast(self, today=None):
+        return _forecast(self.start_day, self.totals[_INCOME], self.totals[_EXPENSE], today)
+
+    def category_totals(self):
+        """[(category, cents)] of expenses, sorted by category like the category_breakdown query."""
+        names, totals, counts = self.category_names, self.category_cents[_EXPENSE], self.category_counts[_EXPENSE]
+        return sorted((names[code], totals[code]) for code in range(len(names)) if counts[code])
+
+_active_cycles = {}  # id(connection) -> ActiveCycle; the ActiveCycle's reference keeps the id from being reused
+
+def active_cycle(cycle_id):
+    """The in-memory copy of cycle_id for this thread's connection, if it is the newest cycle."""
+    conn = get_connection()
+    if conn.in_transaction:
+        return None  # It could pick up rows that are later rolled back
+    cached = _active_cycles.get(id(conn))
+    if cached is not None and cached.cycle_id == cycle_id:
+        if not cached.is_current():
+            cached.refresh()
+        return cached
+    newest = conn.execute("SELECT MAX(id) FROM cycles").fetchone()[0]
+    if cycle_id != newest:
+        return None
+    if len(_active_cycles) >= ACTIVE_CYCLE_MAX_CONNECTIONS:
+        _active_cycles.clear()
+    cached = _active_cycles[id(conn)] = ActiveCycle.load(conn, cycle_id)
+    return cached
+
+def _note_insert(conn, seq_before, seq_after, row_id, row):
+    # add_transaction's own committed row: append it instead of re-reading.
+    cached = _active_cycles.get(id(conn))
+    if cached is None or cached.write_seq != seq_before or seq_after != seq_before + 1:
+        return  # Stale anyway, or another commit slipped in; the next read refreshes
+    cycle_id, t_type, category, cents, _, _, ts_epoch = row
+    if cycle_id == cached.cycle_id and t_type in _TYPE_CODES:
+        cached.append(row_id, t_type, "Misc" if category is None else category, cents, ts_epoch)
+    cached.write_seq = seq_after
+
+# --- Forecast Cache ---
+# A forecast only changes when the calendar day changes or a transaction is
+# written to its cycle, yet the menu and API clients ask for it on every
+# refresh. With FORECAST_CACHE, calculate_burn_rate() answers from a memo keyed
+# on (cycle_id, today, the cycle's write sequence). transaction() bumps the
+# sequence of the cycles a commit touched (of every cycle when it cannot tell)
+# and hands them to a refresher thread, which recomputes the memoized ones on
+# its own connection, usually before the next poll arrives. The same thread
+# wakes every FORECAST_REFRESH_SECONDS to roll over to a new day and to spot
+# commits by other processes through PRAGMA data_version; until it has, the
+# previous forecast is served.
+
+class Forecaster:
+    """Memo of calculate_burn_rate() results with a background refresher thread."""
+
+    def __init__(self, path, interval=None):
+        self.path = path
+        self.interval = FORECAST_REFRESH_SECONDS if interval is None else interval
+        self.hits = self.misses = self.refreshes = 0
+        self._forecasts = {}  # cycle_id -> (today, sequence, forecast)
+        self._seqs = {}  # cycle_id -> writes committed to it
+        self._epoch = 0  # Writes to unknown cycles; part of every sequence
+        self._dirty = set()
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="forecaster", daemon=True)
+        self._thread.start()
+
+    def _sequence(self, cycle_id):
+        return self._epoch, self._seqs.get(cycle_id, 0)
+
+    def get(self, cycle_id):
+        """The cycle's forecast; computed on the calling thread only on a miss."""
+        today = to_day(date.today())
+        entry = self._forecasts.get(cycle_id)
+        if entry is not None and entry[0] == today and entry[1] == self._sequence(cycle_id):
+            self.hits += 1
+            FORECAST_CACHE_HITS.inc()
+            return entry[2]
+        self.misses += 1
+        return self._compute(cycle_id, today)
+
+    def _compute(self, cycle_id, today):
+        # The sequence is read first: a write landing mid-computation leaves the entry stale.
+        sequence = self._sequence(cycle_id)
+        forecast = _calculate_burn_rate(cycle_id)
+        self._forecasts[cycle_id] = (today, sequence, forecast)
+        return forecast
+
+    def written(self, cycle_ids):
+        """Invalidates cycle_ids (None: every cycle) after a commit and queues their refresh."""
+        with self._cond:
+            if cycle_ids is None:
+                self._epoch += 1
+                self._dirty.update(self._forecasts)
+            else:
+                for cycle_id in cycle_ids:
+                    self._seqs[cycle_id] = self._seqs.get(cycle_id, 0) + 1
+                self._dirty.update(cycle_id for cycle_id in cycle_ids if cycle_id in self._forecasts)
+            self._cond.notify()
+
+    def _run(self):
+        version = day = None
+        while True:
+            with self._cond:
+                if not self._dirty and not self._closed:
+                    self._cond.wait(self.interval)
+                if self._closed:
+                    break
+                dirty, self._dirty = self._dirty, set()
+            try:
+                today = to_day(date.today())
+                current = get_connection().execute("PRAGMA data_version").fetchone()[0]
+                if current != version or today != day:
+                    # Another connection committed (possibly one of ours), or a new day began.
+                    dirty.update(self._forecasts)
+                version, day = current, today
+                for cycle_id in dirty:
+                    try:
+                        self._compute(cycle_id, today)
+                        self.refreshes += 1
+                    except ValueError:  # The cycle is gone
+                        self._forecasts.pop(cycle_id, None)
+            except sqlite3.Error:
+                version = None  # E.g. the connection was closed under us; polls compute inline meanwhile
+        get_manager().release()
+
+    def close(self):
+        """Stops the refresher thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hits / lookups if lookups else 0.0,
+                "refreshes": self.refreshes, "cycles": len(self._forecasts)}
+
+_forecaster = None
+_forecaster_lock = threading.Lock()
+
+def get_forecaster():
+    """The shared Forecaster, restarted if DB_NAME changed."""
+    global _forecaster
+    with _forecaster_lock:
+        if _forecaster is None or _forecaster.path != DB_NAME:
+            if _forecaster is not None:
+                _forecaster.close()
+            _forecaster = Forecaster(DB_NAME)
+        return _forecaster
+
+def close_forecaster():
+    global _forecaster
+    with _forecaster_lock:
+        forecaster, _forecaster = _forecaster, None
+    if forecaster is not None:
+        forecaster.close()
+
+# --- Date Range Queries ---
+
+@instrument
+def spend_between(start, end, cycle_id=None):
+    """Total expenses with timestamps in [start, end]; a date as end includes that whole day."""
+    params = _epoch_range(start, end)
+    sql = HOT_QUERIES["spend_between"][0]
+    if cycle_id is not None:
+        sql, params = _SPEND_BETWEEN_SQL.format(select="SUM(amount)", where=" AND cycle_id = ?"), (*params, cycle_id)
+    return from_cents(cached_query(sql, params)[0][0] or 0)
+
+@instrument
+def category_spend_between(start, end):
+    """[(category, total)] of expenses with timestamps in [start, end], sorted by category."""
+    rows = cached_query(HOT_QUERIES["category_spend_between"][0], _epoch_range(start, end))
+    return [(category, from_cents(total)) for category, total in rows]
+
+@instrument
+def transactions_between(start, end, t_type=None):
+    """Yields (id, cycle_id, type, category, amount, description, timestamp) rows in [start, end].
+
+    Streams rows, so unlike the other reads it bypasses the query cache.
+    """
+    types = TRANSACTION_TYPES if t_type is None else (t_type,)
+    sql = f"""SELECT id, cycle_id, type, category, amount, description, timestamp
+              FROM transactions WHERE type IN ({', '.join('?' * len(types))}) AND ts_epoch >= ? AND ts_epoch < ?
+              ORDER BY ts_epoch, id"""
+    for row in get_connection().execute(sql, (*types, *_epoch_range(start, end))):
+        yield (*row[:4], from_cents(row[4]), *row[5:])
+
+@instrument
+def get_category_totals(cycle_id):
+    """[(category, total)] of a cycle's expenses, sorted by category."""
+    return [(category, from_cents(total)) for category, total in _category_breakdown(cycle_id)]
+
+@instrument
+def cycle_report(cycle_id):
+    """((balance, daily_rate, runway), [(category, total)]) of a cycle, read from one snapshot.
+
+    Reports show the two side by side, so this skips the forecast memo (which
+    may lag commits by other processes) and reads both from the same data.
+    """
+    cached = active_cycle(cycle_id) if ACTIVE_CYCLE_CACHE else None
+    if cached is not None:
+        forecast, breakdown = cached.forecast(), cached.category_totals()
+    else:
+        conn = get_connection()
+        snapshot = not conn.in_transaction
+        if snapshot:
+            conn.execute("BEGIN")  # Both queries then see the same commit
+        try:
+            forecast, breakdown = _calculate_burn_rate(cycle_id), _category_breakdown(cycle_id)
+        finally:
+            if snapshot:
+                conn.rollback()
+    return forecast, [(category, from_cents(total)) for category, total in breakdown]
 
-def generate_visual_report(cycle_id):
-    """Generates a category distribution chart with professional validation."""
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    cursor.execute("SELECT category, SUM(amount) FROM transactions WHERE cycle_id = ? AND type = 'expense' GROUP BY category", (cycle_id,))
-    data = cursor.fetchall()
-    conn.close()
+def _category_breakdown(cycle_id):
+    # [(category, cents)] from memory for the active cycle, else from cycle_totals.
+    cached = active_cycle(cycle_id) if ACTIVE_CYCLE_CACHE else None
+    if cached is not None:
+        return cached.category_totals()
+    return cached_query(HOT_QUERIES["category_breakdown"][0], (cycle_id,))
 
+def chart_job(cycle_id):
+    """(cache key, labels, values, title) of the cycle's chart, or None without expenses."""
+    data = _category_breakdown(cycle_id)
     if not data:
-        print("\n⚠️ No expenses found! Add some transactions before generating a chart.")
+        return None
+    labels, values = zip(*data)
+    title = f"Spending Distribution (Cycle {cycle_id})"
+    # Settings are static per renderer class, so a cache hit never imports matplotlib.
+    key = get_chart_cache().key([list(row) for row in data], dict(ChartRenderer.settings(), title=title))
+    return key, labels, values, title
+
+def render_chart(key, labels, values, title):
+    """Returns the cached PNG for key, rendering it on a miss."""
+    cache = get_chart_cache()
+    cached = cache.get(key)
+    if cached is None:
+        return cache.put(key, lambda tmp: get_renderer().render_pie(labels, values, title, tmp))
+    CHART_CACHE_HITS.inc()
+    return cached
+
+def chart_file(cycle_id):
+    """Path of the cycle's chart inside the chart cache, rendering it on a miss; None without expenses.
+
+    The file belongs to the cache: read or copy it, never modify it.
+    """
+    job = chart_job(cycle_id)
+    return None if job is None else render_chart(*job)
+
+@instrument
+def generate_visual_report(cycle_id, quiet=False):
+    """Generates a category distribution chart with professional validation.
+
+    The chart is written to a per-cycle file and reused from the chart cache
+    when the cycle's spending has not changed. Returns the PNG path, or None.
+    """
+    cached = chart_file(cycle_id)
+    if cached is None:
+        if not quiet:
+            print("\n⚠️ No expenses found! Add some transactions before generating a chart.")
         return
 
-    labels, values = zip(*data)
-    plt.figure(figsize=(10, 6))
-    plt.pie(values, labels=labels, autopct='%1.1f%%', startangle=140, colors=plt.cm.Paired.colors)
-    plt.title(f"Spending Distribution (Cycle {cycle_id})")
-    plt.axis('equal') 
-    plt.savefig("spending_report.png")
-    print("\n📈 Success: 'spending_report.png' generated in your project folder.")
+    path = REPORT_PATH.format(cycle_id=cycle_id)
+    shutil.copyfile(cached, path)
+    if not quiet:
+        print(f"\n📈 Success: '{path}' generated in your project folder.")
+    return path
+
+# --- Command-Line Interface ---
+# Every command is a function taking keyword arguments and returning a
+# JSON-serializable result, shared by the argparse subcommands and --batch.
+
+def _cycle_or_current(cycle_id):
+    if cycle_id is not None:
+        # Checked up front: an insert would only fail with a bare FOREIGN KEY error.
+        if not cached_query("SELECT 1 FROM cycles WHERE id = ?", (cycle_id,)):
+            raise CycleNotFound(f"No cycle with id {cycle_id}")
+        return cycle_id
+    cycle = get_current_cycle()
+    if cycle is None:
+        raise CycleNotFound("No budget cycle yet; run 'new-cycle' first")
+    return cycle[0]
+
+def cmd_add(amount, category="Misc", type='expense', description="CLI Entry", cycle_id=None):
+    if type not in TRANSACTION_TYPES:
+        raise ValueError(f"type must be one of {TRANSACTION_TYPES}")
+    if to_cents(amount) <= 0:
+        raise ValueError("amount must be positive")
+    cycle_id = _cycle_or_current(cycle_id)
+    return {"id": add_transaction(cycle_id, type, amount, category or "Misc", description, quiet=True),
+            "cycle_id": cycle_id}
+
+def cmd_bulk_add(rows, cycle_id=None):
+    cycle_id = _cycle_or_current(cycle_id)
+    return {"inserted": add_transactions(cycle_id, (tuple(row) for row in rows)), "cycle_id": cycle_id}
+
+def cmd_import(file, cycle_id=None, mapping=None, workers=None, **options):
+    import budget_importer  # Imports this module, so load it on demand
+    cycle_id = _cycle_or_current(cycle_id)
+    stats = budget_importer.import_csv(file, cycle_id, mapping, workers=workers, **options)
+    stats["cycle_id"] = cycle_id
+    return stats
+
+def cmd_burn_rate(cycle_id=None, all=False):
+    if all:
+        return [{"cycle_id": cid, "balance": bal, "daily_rate": rate, "runway": runway}
+                for cid, (bal, rate, runway) in calculate_burn_rates().items()]
+    cycle_id = _cycle_or_current(cycle_id)
+    bal, rate, runway = calculate_burn_rate(cycle_id)
+    return {"cycle_id": cycle_id, "balance": bal, "daily_rate": rate, "runway": runway}
+
+def cmd_chart(cycle_id=None):
+    cycle_id = _cycle_or_current(cycle_id)
+    return {"cycle_id": cycle_id, "path": generate_visual_report(cycle_id, quiet=True)}
+
+def cmd_new_cycle(income, rollover=0.0):
+    if to_cents(income) < 0:
+        raise ValueError("income must not be negative")
+    return {"cycle_id": start_new_cycle(income, rollover)}
+
+def cmd_report(cycle_id=None):
+    cycle_id = _cycle_or_current(cycle_id)
+    (bal, rate, runway), categories = cycle_report(cycle_id)
+    return {"cycle_id": cycle_id, "balance": bal, "daily_rate": rate, "runway": runway,
+            "categories": dict(categories)}
+
+def cmd_rebuild_totals():
+    rebuild_cycle_totals()
+    return {"mismatches": len(check_cycle_totals())}
+
+def cmd_check_totals():
+    return {"mismatches": [list(row) for row in check_cycle_totals()]}
+
+def cmd_metrics():
+    return METRICS.render()
+
+def cmd_stats(file=None, reset=False):
+    if file:
+        with open(file) as f:
+            return json.load(f)
+    result = budget_stats.snapshot()
+    if reset:
+        budget_stats.reset()
+    return result
+
+def cmd_cache_stats():
+    return query_cache_stats()
+
+COMMANDS = {
+    "add": cmd_add,
+    "bulk-add": cmd_bulk_add,
+    "import": cmd_import,
+    "burn-rate": cmd_burn_rate,
+    "chart": cmd_chart,
+    "new-cycle": cmd_new_cycle,
+    "report": cmd_report,
+    "rebuild-totals": cmd_rebuild_totals,
+    "check-totals": cmd_check_totals,
+    "metrics": cmd_metrics,
+    "stats": cmd_stats,
+    "cache-stats": cmd_cache_stats,
+}
+
+def execute_command(command):
+    """Runs one {"cmd": name, **kwargs} command dict and returns its result."""
+    command = dict(command)
+    name = command.pop("cmd", None)
+    if name not in COMMANDS:
+        raise ValueError(f"Unknown command {name!r}; choose from {', '.join(COMMANDS)}")
+    return COMMANDS[name](**command)
+
+def run_batch(lines, out):
+    """Executes newline-delimited JSON commands over one connection and one transaction.
+
+    Writes one JSON result line per command ({"ok": true, "result": ...} or
+    {"ok": false, "error": ...}) and returns the number of failed commands.
+    A failed command is rolled back on its own (in a SAVEPOINT once earlier
+    commands have written), so it leaves nothing behind in the commit.
+    """
+    failures = 0
+    dumps = json.dumps
+    with transaction() as conn:
+        for line in lines:
+            if not line.strip():
+                continue
+            # Until something is written there is no transaction to protect, and
+            # opening one early would turn a read-only batch into a lock holder.
+            savepoint = conn.in_transaction
+            if savepoint:
+                conn.execute("SAVEPOINT batch_command")
+            try:
+                result = execute_command(json.loads(line))
+            except (ValueError, TypeError, KeyError, ArithmeticError, OSError, sqlite3.Error) as e:
+                if savepoint:
+                    conn.execute("ROLLBACK TO batch_command")
+                    conn.execute("RELEASE batch_command")
+                elif conn.in_transaction:
+                    conn.rollback()
+                failures += 1
+                out.write(dumps({"ok": False, "error": f"{type(e).__name__}: {e}"}) + "\n")
+            else:
+                if savepoint:
+                    conn.execute("RELEASE batch_command")
+                out.write(dumps({"ok": True, "result": result}) + "\n")
+    return failures
+
+def _read_bulk_rows(path):
+    """Yields (type, amount, category, description, timestamp) rows from a headerless CSV."""
+    with (open(path, newline="") if path != "-" else sys.stdin) as f:
+        for row in csv.reader(f):
+            if row:
+                t_type, amount, category, desc, timestamp = (row + [""] * 5)[:5]
+                yield t_type, amount, category, desc, timestamp or None  # to_cents() validates the amount
+
+def _print_forecast(bal, rate, runway, out=None):
+    print(f"\n--- 📈 FINANCIAL FORECAST ---", file=out)
+    print(f"Current Balance : ${bal:,.2f}", file=out)
+    print(f"Daily Spend Rate: ${rate:,.2f}/day", file=out)
+    if rate > 0:
+        print(f"Est. Runway    : {runway:.1f} days remaining", file=out)
+    else:
+        print("Est. Runway    : Infinite (No expenses recorded)", file=out)
+
+def _amount_arg(text):
+    """argparse type for amounts: the exact Decimal, or a usage error instead of InvalidOperation."""
+    try:
+        return Decimal(text)
+    except InvalidOperation:
+        raise argparse.ArgumentTypeError(f"invalid amount: {text!r}") from None
+
+def build_parser(parser_class=argparse.ArgumentParser):
+    parser = parser_class(
+        prog="budget_tracker.py",
+        description="Pay-cycle finance tracker. Run without arguments for the interactive menu.")
+    parser.add_argument("--db", help=f"Database file (default: {DB_NAME})")
+    parser.add_argument("--profile", choices=list(PRAGMA_PROFILES), help="Pragma profile to apply")
+    parser.add_argument("--batch", action="store_true",
+                        help="Read newline-delimited JSON commands from stdin, e.g. {\"cmd\": \"add\", \"amount\": 12.5}")
+    parser.add_argument("--json", action="store_true", help="Print command results as JSON")
+    parser.add_argument("--stats", action="store_true", help="Time functions and SQL; print a summary on exit")
+    parser.add_argument("--stats-json", metavar="FILE", help="Write the timing summary to FILE as JSON on exit")
+    parser.add_argument("--slow-query-ms", type=float, metavar="MS", help="Log SQL statements slower than MS")
+    parser.add_argument("--slow-log", metavar="FILE", help="Append the slow-query log to FILE instead of stderr")
+    parser.add_argument("--metrics-port", type=int, metavar="PORT",
+                        help="Serve Prometheus metrics on localhost:PORT/metrics while running")
+    sub = parser.add_subparsers(dest="command")
+
+    p = sub.add_parser("add", help="Record a transaction")
+    p.add_argument("amount", type=_amount_arg)
+    p.add_argument("category", nargs="?", default="Misc")
+    p.add_argument("--type", choices=TRANSACTION_TYPES, default="expense")
+    p.add_argument("--description", default="CLI Entry")
+    p.add_argument("--cycle", dest="cycle_id", type=int)
+
+    p = sub.add_parser("bulk-add", help="Insert headerless CSV rows: type,amount,category,description,timestamp")
+    p.add_argument("file", nargs="?", default="-", help="CSV file, or - for stdin")
+    p.add_argument("--cycle", dest="cycle_id", type=int)
+
+    p = sub.add_parser("import", help="Stream a bank-statement CSV into a cycle")
+    p.add_argument("file")
+    p.add_argument("--cycle", dest="cycle_id", type=int)
+    p.add_argument("--map", dest="mapping", action="append", default=[], metavar="FIELD=COLUMN",
+                   help="Map date/description/amount/category/type/debit/credit to a header name or index")
+    p.add_argument("--date-format", help="strptime format for the date column (default: ISO 8601)")
+    p.add_argument("--expense-sign", choices=("negative", "positive"), default="negative",
+                   help="Sign the amount column uses for expenses")
+    p.add_argument("--delimiter", default=",")
+    p.add_argument("--no-header", dest="has_header", action="store_false")
+    p.add_argument("--workers", type=int, help="Parser processes (default: CPU count, 0 = inline)")
+    p.add_argument("--chunk-size", type=int)
+    p.add_argument("--strict", action="store_true", help="Abort on the first invalid record")
+
+    p = sub.add_parser("burn-rate", help="Show balance, daily spend and runway")
+    p.add_argument("--cycle", dest="cycle_id", type=int)
+    p.add_argument("--all", action="store_true", help="Every cycle at once")
+
+    p = sub.add_parser("chart", help="Render the category pie chart")
+    p.add_argument("--cycle", dest="cycle_id", type=int)
+
+    p = sub.add_parser("new-cycle", help="Start a new budget cycle")
+    p.add_argument("income", type=_amount_arg)
+    p.add_argument("--rollover", type=_amount_arg, default=Decimal(0))
+
+    p = sub.add_parser("report", help="Forecast plus spending per category")
+    p.add_argument("--cycle", dest="cycle_id", type=int)
+
+    sub.add_parser("rebuild-totals", help="Recompute the cycle_totals table")
+    sub.add_parser("check-totals", help="Compare cycle_totals against a full recompute")
+
+    sub.add_parser("metrics", help="Print the Prometheus metrics of this process")
+    sub.add_parser("cache-stats", help="Query cache hit rate and size of this process (e.g. the daemon)")
+
+    p = sub.add_parser("stats", help="Show a timing summary written by --stats-json")
+    p.add_argument("file", nargs="?", help="JSON summary (default: this process, e.g. inside --batch)")
+
+    p = sub.add_parser("daemon", help="Serve commands over a Unix socket for budget_client.py")
+    p.add_argument("--socket", default=SOCKET_PATH, help=f"Socket path (default: {SOCKET_PATH})")
+
+    p = sub.add_parser("api", help="Serve the HTTP JSON API on localhost")
+    p.add_argument("--port", type=int, default=8765, help="TCP port (default: 8765; 0 picks a free one)")
+    return parser
+
+GLOBAL_OPTIONS = ("db", "profile", "batch", "json", "stats", "stats_json", "slow_query_ms", "slow_log",
+                  "metrics_port", "command", "file")
+
+def run_cli(args, out=None):
+    """Runs one parsed subcommand and prints its result to out (stdout); returns the exit status."""
+    out = out or sys.stdout
+    kwargs = {k: v for k, v in vars(args).items() if k not in GLOBAL_OPTIONS}
+    if args.command == "bulk-add":
+        kwargs["rows"] = _read_bulk_rows(args.file)
+    elif args.command == "stats":
+        kwargs["file"] = args.file
+    elif args.command == "import":
+        import budget_importer
+        kwargs["file"] = args.file
+        kwargs["mapping"] = dict(item.split("=", 1) for item in args.mapping if "=" in item)
+        if len(kwargs["mapping"]) != len(args.mapping):
+            raise ValueError("--map expects FIELD=COLUMN")
+        if out is sys.stdout and sys.stderr.isatty():
+            kwargs["progress"] = budget_importer.print_progress
+    result = COMMANDS[args.command](**kwargs)
+    if args.json:
+        print(json.dumps(result, default=str), file=out)
+    elif args.command in ("burn-rate", "report") and not kwargs.get("all"):
+        _print_forecast(result["balance"], result["daily_rate"], result["runway"], out)
+        for category, total in result.get("categories", {}).items():
+            print(f"  {category:<16}${total:>12,.2f}", file=out)
+    elif args.command == "burn-rate":
+        for row in result:
+            print(f"Cycle {row['cycle_id']:>4}: ${row['balance']:>12,.2f}  ${row['daily_rate']:>10,.2f}/day"
+                  f"  {row['runway']:>7.1f} days", file=out)
+    elif args.command == "chart":
+        print(f"📈 {result['path']}" if result["path"] else "⚠️ No expenses found for this cycle.", file=out)
+    elif args.command == "import":
+        if "progress" in kwargs:
+            print(file=sys.stderr)
+        print(f"✅ Imported {result['inserted']:,} of {result['read']:,} records into cycle {result['cycle_id']}"
+              f" in {result['seconds']:.1f}s ({result['rows_per_sec']:,.0f} rows/s)", file=out)
+        if result["duplicates"]:
+            print(f"  ↩️ {result['duplicates']:,} already-imported records skipped", file=out)
+        for number, message in result["errors"]:
+            print(f"  ⚠️ record {number}: {message}", file=out)
+        if result["skipped"] > len(result["errors"]):
+            print(f"  ... {result['skipped'] - len(result['errors'])} more skipped", file=out)
+    elif args.command == "metrics":
+        print(result, end="", file=out)
+    elif args.command == "cache-stats":
+        print(f"Query cache: {result['hits']:,} hits / {result['misses']:,} misses ({result['hit_rate']:.1%}),"
+              f" {result['entries']:,} entries, {result['bytes'] / 2**10:,.1f} of {result['max_bytes'] / 2**10:,.0f} KiB",
+              file=out)
+    elif args.command == "stats":
+        print(budget_stats.format_table(result) if result else "No timings recorded; run a command with --stats.",
+              file=out)
+    elif args.command == "check-totals":
+        print("✅ cycle_totals is consistent." if not result["mismatches"] else
+              f"❌ {len(result['mismatches'])} mismatched rows; run 'rebuild-totals'.", file=out)
+    else:
+        print(f"✅ {args.command}: {result}", file=out)
+    return 1 if args.command == "check-totals" and result["mismatches"] else 0
+
+def _enable_stats(args):
+    import logging
+    if args.slow_query_ms is not None:
+        handler = logging.FileHandler(args.slow_log) if args.slow_log else logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(asctime)s slow query %(message)s"))
+        logging.getLogger(budget_stats.SLOW_LOG_NAME).addHandler(handler)
+    close_connections()  # Connections opened from here on are instrumented
+    budget_stats.enable(args.slow_query_ms)
+
+def main(argv=None):
+    global DB_NAME
+    args = build_parser().parse_args(argv)
+    if args.db:
+        DB_NAME = args.db
+    if args.stats or args.stats_json or args.slow_query_ms is not None:
+        _enable_stats(args)
+    if args.metrics_port is not None:
+        budget_metrics.serve(args.metrics_port)
+    try:
+        if not args.batch and not args.command:
+            return run_menu(args.profile)
+
+        init_db(args.profile)
+        try:
+            if args.batch:
+                return 1 if run_batch(sys.stdin, sys.stdout) else 0
+            if args.command == "daemon":
+                import budget_daemon
+                return budget_daemon.serve(args.socket)
+            if args.command == "api":
+                import budget_api
+                return budget_api.serve(args.port)
+            try:
+                return run_cli(args)
+            except (ValueError, ArithmeticError, OSError, sqlite3.Error) as e:
+                print(f"❌ {e}", file=sys.stderr)
+                return 1
+        finally:
+            close_connections()
+    finally:
+        if args.stats_json:
+            budget_stats.dump_json(args.stats_json)
+        if args.stats and budget_stats.snapshot():
+            print(budget_stats.format_table(budget_stats.snapshot()), file=sys.stderr)
 
 # --- Main Interface ---
 
-def main():
-    init_db()
+def run_menu(profile=None):
+    global ACTIVE_CYCLE_CACHE, FORECAST_CACHE
+    ACTIVE_CYCLE_CACHE = FORECAST_CACHE = True  # The whole session works on one cycle
+    init_db(profile)
     cycle = get_current_cycle()
     
     if not cycle:
@@ -168,23 +2061,21 @@ def main():
             add_transaction(cycle[0], 'expense', amt, cat, "User Entry")
 
         elif choice == '2':
-            bal, rate, runway = calculate_burn_rate(cycle[0])
-            print(f"\n--- 📈 FINANCIAL FORECAST ---")
-            print(f"Current Balance : ${bal:,.2f}")
-            print(f"Daily Spend Rate: ${rate:,.2f}/day")
-            if rate > 0:
-                print(f"Est. Runway    : {runway:.1f} days remaining")
-            else:
-                print("Est. Runway    : Infinite (No expenses recorded)")
+            _print_forecast(*calculate_burn_rate(cycle[0]))
 
         elif choice == '3':
             generate_visual_report(cycle[0])
 
         elif choice == '4':
             print("Goodbye! Keeping your finances on track. 🚀")
+            close_connections()
+            close_renderer()
             break
         else:
             print("❌ Invalid selection. Please choose 1-4.")
 
 if __name__ == "__main__":
-    main()
+    # Sibling modules (budget_importer) import budget_tracker; hand them this
+    # instance so they share DB_NAME and the connection manager.
+    sys.modules.setdefault("budget_tracker", sys.modules[__name__])
+    sys.exit(main())